@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import numpy as np
 
 class BaseAgent(ABC):
     @abstractmethod
@@ -10,3 +11,30 @@ class BaseAgent(ABC):
         :return: The action to be taken.
         """
         pass
+
+    def act_batch(self, observations):
+        """
+        Perform one action per observation in a batch.
+
+        The default calls act for every row; agents that can vectorize should override it.
+
+        :param observations: Array of shape (N, ...) with one observation per row, e.g. (N, 2) positions.
+        :return: Int array of shape (N,) with the actions to be taken.
+        """
+        return np.array([self.act(observation) for observation in observations], dtype=np.int64)
+
+    def action_probabilities(self, observations, n_actions=4):
+        """
+        Probability of each action for every observation in a batch.
+
+        The default assumes a deterministic policy and one-hot encodes act_batch; stochastic agents
+        should override it so exact evaluation sees their true action distribution.
+
+        :param observations: Array of shape (N, ...) with one observation per row.
+        :param n_actions: Number of actions.
+        :return: Float array of shape (N, n_actions) whose rows sum to 1.
+        """
+        actions = np.asarray(self.act_batch(observations), dtype=np.int64)
+        probs = np.zeros((len(actions), n_actions))
+        probs[np.arange(len(actions)), actions] = 1.0
+        return probs
@@ -1,13 +1,115 @@
 import numpy as np
 from ..base_agent import BaseAgent
+from environments.custom.tabular_mdp import transition_table, obstacle_occupancy, ACTION_DELTAS
 
 class CheatingAgent(BaseAgent):
-    def __init__(self, target_pos, grid_size, obstacles=None):
-        self.target_pos = np.array(target_pos)
+    def __init__(self, target_pos, grid_size, obstacles=None, mode='greedy'):
+        """
+        Agent that knows the grid layout and heads straight for the target.
+
+        :param target_pos: (row, col) target position.
+        :param grid_size: Side length of the square grid.
+        :param obstacles: Obstacle positions or occupancy grid, see tabular_mdp.obstacle_occupancy.
+        :param mode: 'greedy' picks the neighbour closest to the target in Euclidean distance,
+            'bfs' follows a shortest path around obstacles using a precomputed distance field.
+        """
+        if mode not in ('greedy', 'bfs'):
+            raise ValueError(f"Unknown mode {mode}")
+        self.mode = mode
+        self.target_pos = target_pos
         self.grid_size = grid_size
-        self.obstacles = [np.array(obs) for obs in obstacles] if obstacles else []
+        self.obstacles = obstacles
+
+    # The BFS tables depend on the layout, so replacing any of it invalidates them.
+    # In-place edits of the obstacles array must be followed by invalidate().
+    @property
+    def target_pos(self):
+        return self._target_pos
+
+    @target_pos.setter
+    def target_pos(self, value):
+        self._target_pos = np.array(value)
+        self.invalidate()
+
+    @property
+    def grid_size(self):
+        return self._grid_size
+
+    @grid_size.setter
+    def grid_size(self, value):
+        self._grid_size = value
+        self.invalidate()
+
+    @property
+    def obstacles(self):
+        return self._obstacles
+
+    @obstacles.setter
+    def obstacles(self, value):
+        # Stored as a (K, 2) array; the occupancy mask is derived lazily for the current grid_size
+        if isinstance(value, np.ndarray) and value.dtype == bool:
+            value = np.argwhere(value)
+        elif value is None or len(value) == 0:
+            value = np.zeros((0, 2), dtype=np.int64)
+        self._obstacles = np.asarray(value, dtype=np.int64).reshape(-1, 2)
+        self.invalidate()
+
+    @property
+    def obstacle_mask(self):
+        """
+        Bool occupancy grid of the obstacles, True for obstacles.
+        """
+        if self._obstacle_mask is None:
+            self._obstacle_mask = obstacle_occupancy(self._obstacles, self.grid_size)
+        return self._obstacle_mask
+
+    def invalidate(self):
+        """
+        Marks the distance field, next-action table and obstacle mask as stale, they are rebuilt on the next act.
+        """
+        self._distance_field = None
+        self._next_action = None
+        self._obstacle_mask = None
+
+    @property
+    def distance_field(self):
+        """
+        Shortest-path distance (in steps) from every cell to the target, -1 for unreachable cells.
+        """
+        if self._distance_field is None:
+            self._build_tables()
+        return self._distance_field.reshape(self.grid_size, self.grid_size)
+
+    def _build_tables(self):
+        size = self.grid_size
+        next_state, _, _ = transition_table(size, self.target_pos, self.obstacle_mask)
+        n_states = size * size
+
+        # Level-synchronous BFS from the target. Moves are symmetric on free cells and
+        # next_state never enters an obstacle, so expanding along it yields distances to the target.
+        distance = np.full(n_states, -1, dtype=np.int64)
+
+        frontier = np.array([self.target_pos[0] * size + self.target_pos[1]])
+        distance[frontier] = 0
+        level = 0
+        while frontier.size:
+            level += 1
+            neighbours = np.unique(next_state[frontier].ravel())
+            neighbours = neighbours[distance[neighbours] < 0]
+            distance[neighbours] = level
+            frontier = neighbours
+
+        # Greedy descent on the distance field; unreachable successors count as infinitely far
+        successor_distance = np.where(distance[next_state] < 0, np.iinfo(np.int64).max, distance[next_state])
+        self._next_action = successor_distance.argmin(axis=1)
+        self._distance_field = distance
 
     def act(self, observation):
+        if self.mode == 'bfs':
+            if self._next_action is None:
+                self._build_tables()
+            return int(self._next_action[observation[0] * self.grid_size + observation[1]])
+
         agent_pos = np.array(observation)
         # Simple greedy strategy: move closer to target_pos, avoid obstacles
         # This is a basic example; a true optimal might need pathfinding (A*)
@@ -31,7 +133,7 @@ class CheatingAgent(BaseAgent):
                     0 <= next_pos_candidate[1] < self.grid_size):
                 continue
             # Check obstacles
-            if any(np.array_equal(next_pos_candidate, obs) for obs in self.obstacles):
+            if self.obstacle_mask[next_pos_candidate[0], next_pos_candidate[1]]:
                 continue
 
             dist_to_target = np.linalg.norm(next_pos_candidate - self.target_pos)
@@ -58,9 +160,65 @@ class CheatingAgent(BaseAgent):
                 if not (0 <= next_pos_candidate[0] < self.grid_size and \
                         0 <= next_pos_candidate[1] < self.grid_size):
                     continue
-                if any(np.array_equal(next_pos_candidate, obs) for obs in self.obstacles):
+                if self.obstacle_mask[next_pos_candidate[0], next_pos_candidate[1]]:
                     continue
                 valid_actions.append(action)
             if valid_actions:
                 return np.random.choice(valid_actions)
-            return np.random.randint(4) # Fallback: truly random if completely boxed in by design flaw
\ No newline at end of file
+            return np.random.randint(4) # Fallback: truly random if completely boxed in by design flaw
+
+    def act_batch(self, observations):
+        """
+        Vectorized act over an (N, 2) array of observations, with the same decision rule as act.
+        """
+        observations = np.asarray(observations, dtype=np.int64)
+        if self.mode == 'bfs':
+            if self._next_action is None:
+                self._build_tables()
+            return self._next_action[observations[:, 0] * self.grid_size + observations[:, 1]]
+
+        actions, stuck, valid = self._greedy_batch(observations)
+        # Otherwise a random valid move, or a random one if boxed in
+        if np.any(stuck):
+            keys = np.random.random((int(stuck.sum()), 4))
+            stuck_valid = valid[stuck]
+            random_valid = np.where(stuck_valid, keys, -1.0).argmax(axis=1)
+            actions[stuck] = np.where(stuck_valid.any(axis=1), random_valid, np.random.randint(4, size=len(keys)))
+        return actions
+
+    def action_probabilities(self, observations, n_actions=4):
+        """
+        Exact action distribution of act, including the uniform random fallback when no move helps.
+        """
+        observations = np.asarray(observations, dtype=np.int64)
+        if n_actions < 4:
+            raise ValueError(f"CheatingAgent uses 4 actions, got n_actions={n_actions}")
+        if self.mode == 'bfs':
+            return super().action_probabilities(observations, n_actions)
+
+        actions, stuck, valid = self._greedy_batch(observations)
+        probs = np.zeros((len(observations), n_actions))
+        probs[np.arange(len(observations)), actions] = 1.0
+        fallback = np.where(valid.any(axis=1, keepdims=True), valid, True)
+        probs[stuck, :4] = fallback[stuck] / fallback[stuck].sum(axis=1, keepdims=True)
+        return probs
+
+    def _greedy_batch(self, observations):
+        # Deterministic part of the greedy rule: (actions, stuck, valid), actions are meaningless where stuck
+        # (N, 4, 2) neighbour candidates and their validity
+        candidates = observations[:, None, :] + ACTION_DELTAS[None, :, :]
+        in_bounds = np.all((candidates >= 0) & (candidates < self.grid_size), axis=-1)
+        clipped = np.clip(candidates, 0, self.grid_size - 1)
+        valid = in_bounds & ~self.obstacle_mask[clipped[..., 0], clipped[..., 1]]
+
+        dist = np.sqrt(np.sum((candidates - self.target_pos) ** 2, axis=-1))
+        current = np.sqrt(np.sum((observations - self.target_pos) ** 2, axis=-1))[:, None]
+
+        # First closest strictly improving move, else the first move keeping the distance
+        improving = valid & (dist < current)
+        keeping = valid & (dist == current)
+        actions = np.where(improving.any(axis=1),
+                           np.where(improving, dist, np.inf).argmin(axis=1),
+                           keeping.argmax(axis=1))
+        stuck = ~(improving.any(axis=1) | keeping.any(axis=1))
+        return actions, stuck, valid
@@ -1,14 +1,23 @@
 import numpy as np
 from ..base_agent import BaseAgent
+from utils.buffered_rng import BufferedRNG
 
 class RandomAgent(BaseAgent):
-    def __init__(self, action_space):
+    def __init__(self, action_space, seed=None):
         """
         Initializes the RandomAgent with a given action space.
         
         :param action_space: The action space of the environment (e.g., gymnasium.spaces.Discrete).
+        :param seed: Seed of the agent's own random number generator.
         """
         self.action_space = action_space
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """
+        Reseeds the agent's generator, discarding any pre-drawn actions.
+        """
+        self._rng = BufferedRNG(np.random.default_rng(seed), int(self.action_space.n))
 
     def act(self, obs):
         """
@@ -17,4 +26,21 @@ class RandomAgent(BaseAgent):
         :param observation: The current observation from the environment (not used in this agent).
         :return: A randomly selected action.
         """
-        return self.action_space.sample()
\ No newline at end of file
+        return int(self.action_space.start) + self._rng.integer()
+
+    def act_batch(self, observations):
+        """
+        Selects one random action per observation with a single generator call.
+        """
+        return int(self.action_space.start) + self._rng.integers(len(observations))
+
+    def action_probabilities(self, observations, n_actions=4):
+        """
+        Uniform distribution over the action space for every observation.
+        """
+        start, n = int(self.action_space.start), int(self.action_space.n)
+        if start < 0 or start + n > n_actions:
+            raise ValueError(f"Actions {start}..{start + n - 1} do not fit into {n_actions} actions")
+        probs = np.zeros((len(observations), n_actions))
+        probs[:, start:start + n] = 1.0 / n
+        return probs
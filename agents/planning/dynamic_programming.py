@@ -0,0 +1,81 @@
+from functools import reduce
+import numpy as np
+
+
+def _max_over_actions(q_values):
+    # Column-wise maximum, much faster than q_values.max(axis=1) for a handful of actions
+    return reduce(np.maximum, q_values.T)
+
+
+def value_iteration(mdp, gamma=0.99, tol=1e-8, max_iterations=10000):
+    """
+    Runs vectorized value iteration on a TabularMDP.
+
+    :param mdp: The TabularMDP to solve.
+    :param gamma: Discount factor.
+    :param tol: Stop once the largest value change falls below this threshold.
+    :param max_iterations: Maximum number of Bellman backups.
+    :return: (values, policy) with shapes (S,) and (S,).
+    """
+    values = np.zeros(mdp.n_states)
+    for _ in range(max_iterations):
+        q_values = mdp.expected_next(values, gamma)
+        new_values = _max_over_actions(q_values)
+        delta = np.max(np.abs(new_values - values))
+        values = new_values
+        if delta < tol:
+            break
+    policy = mdp.expected_next(values, gamma).argmax(axis=1)
+    return values, policy
+
+
+def evaluate_policy(mdp, policy, gamma=0.99, tol=1e-8, max_iterations=10000, values=None):
+    """
+    Iterative policy evaluation of a deterministic policy on a TabularMDP.
+
+    :param mdp: The TabularMDP.
+    :param policy: Int array of shape (S,) with the action taken in each state.
+    :param gamma: Discount factor.
+    :param tol: Stop once the largest value change falls below this threshold.
+    :param max_iterations: Maximum number of sweeps.
+    :param values: Optional initial value estimate of shape (S,).
+    :return: Float array of shape (S,) with the policy's state values.
+    """
+    states = np.arange(mdp.n_states)
+    next_states = mdp.next_states[states, policy]
+    probs = mdp.probs[states, policy]
+    rewards = mdp.rewards[states, policy]
+
+    values = np.zeros(mdp.n_states) if values is None else values.copy()
+    for _ in range(max_iterations):
+        continuation = np.where(mdp.terminal, 0.0, values)
+        new_values = rewards + gamma * np.einsum('sk,sk->s', probs, continuation[next_states])
+        delta = np.max(np.abs(new_values - values))
+        values = new_values
+        if delta < tol:
+            break
+    return values
+
+
+def policy_iteration(mdp, gamma=0.99, tol=1e-8, max_iterations=1000):
+    """
+    Runs policy iteration on a TabularMDP, alternating iterative evaluation and greedy improvement.
+
+    :param mdp: The TabularMDP to solve.
+    :param gamma: Discount factor.
+    :param tol: Tolerance of the inner policy evaluation.
+    :param max_iterations: Maximum number of improvement steps.
+    :return: (values, policy) with shapes (S,) and (S,).
+    """
+    policy = np.zeros(mdp.n_states, dtype=np.int64)
+    values = None
+    for _ in range(max_iterations):
+        values = evaluate_policy(mdp, policy, gamma, tol, values=values)
+        q_values = mdp.expected_next(values, gamma)
+        # Keep the current action on ties so the loop terminates
+        current = q_values[np.arange(mdp.n_states), policy]
+        new_policy = np.where(_max_over_actions(q_values) > current + tol, q_values.argmax(axis=1), policy)
+        if np.array_equal(new_policy, policy):
+            break
+        policy = new_policy
+    return values, policy
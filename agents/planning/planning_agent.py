@@ -0,0 +1,33 @@
+from ..base_agent import BaseAgent
+from .dynamic_programming import value_iteration, policy_iteration
+from environments.custom.tabular_mdp import build_tabular_mdp
+
+class PlanningAgent(BaseAgent):
+    def __init__(self, env, gamma=0.99, method='value_iteration', tol=1e-8):
+        """
+        Solves the environment's tabular MDP once and acts from the resulting lookup table.
+
+        :param env: A GridWorldEnv or SlipGridWorldEnv to plan for.
+        :param gamma: Discount factor.
+        :param method: 'value_iteration' or 'policy_iteration'.
+        :param tol: Convergence tolerance of the planner.
+        """
+        if method == 'value_iteration':
+            solver = value_iteration
+        elif method == 'policy_iteration':
+            solver = policy_iteration
+        else:
+            raise ValueError(f"Unknown planning method {method}")
+
+        self.grid_size = env.size
+        self.mdp = build_tabular_mdp(env)
+        self.values, self.policy = solver(self.mdp, gamma=gamma, tol=tol)
+
+    def act(self, observation):
+        """
+        Looks up the optimal action for the given (row, col) observation.
+
+        :param observation: The agent's (row, col) position.
+        :return: The action to be taken.
+        """
+        return int(self.policy[observation[0] * self.grid_size + observation[1]])
@@ -0,0 +1,9 @@
+from .tabular_agent import TabularAgent
+
+class ExpectedSarsaAgent(TabularAgent):
+    """
+    TD control bootstrapping from the expected value of Q(s', .) under the epsilon-greedy policy.
+    """
+    def _next_values(self, next_states, next_actions):
+        q_next = self.q[next_states]
+        return (1.0 - self.epsilon) * q_next.max(axis=1) + self.epsilon * q_next.mean(axis=1)
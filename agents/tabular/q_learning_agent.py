@@ -0,0 +1,8 @@
+from .tabular_agent import TabularAgent
+
+class QLearningAgent(TabularAgent):
+    """
+    Off-policy TD control, bootstrapping from the greedy value max_a Q(s', a).
+    """
+    def _next_values(self, next_states, next_actions):
+        return self.q[next_states].max(axis=1)
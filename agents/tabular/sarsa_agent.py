@@ -0,0 +1,10 @@
+from .tabular_agent import TabularAgent
+
+class SarsaAgent(TabularAgent):
+    """
+    On-policy TD control, bootstrapping from Q(s', a') of the action actually taken next.
+    """
+    def _next_values(self, next_states, next_actions):
+        if next_actions is None:
+            raise ValueError("SARSA updates need the next actions.")
+        return self.q[next_states, next_actions]
@@ -0,0 +1,125 @@
+from abc import abstractmethod
+import numpy as np
+from ..base_agent import BaseAgent
+from utils.buffered_rng import BufferedRNG
+
+class TabularAgent(BaseAgent):
+    def __init__(self, grid_size, n_actions=4, alpha=0.1, gamma=0.99, epsilon=0.1, initial_value=0.0, seed=None):
+        """
+        Base class for epsilon-greedy agents with a Q-table indexed by the gridworld's flat state row * size + col.
+
+        Subclasses only define how the bootstrap value of the next state is computed.
+
+        :param grid_size: Side length of the square grid, the table has grid_size ** 2 rows.
+        :param n_actions: Number of actions.
+        :param alpha: Learning rate.
+        :param gamma: Discount factor.
+        :param epsilon: Exploration probability.
+        :param initial_value: Initial value of every Q-table entry.
+        :param seed: Seed of the agent's random number generator.
+        """
+        self.grid_size = grid_size
+        self.n_states = grid_size * grid_size
+        self.n_actions = n_actions
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.q = np.full((self.n_states, n_actions), initial_value, dtype=np.float64)
+        self.seed(seed)
+
+    @classmethod
+    def from_env(cls, env, **kwargs):
+        """
+        Builds an agent sized for a GridWorldEnv, SlipGridWorldEnv or VectorGridWorldEnv.
+        """
+        return cls(env.size, **kwargs)
+
+    def seed(self, seed=None):
+        self._rng = BufferedRNG(np.random.default_rng(seed), self.n_actions)
+
+    def state(self, observation):
+        return int(observation[0]) * self.grid_size + int(observation[1])
+
+    def states(self, observations):
+        observations = np.asarray(observations)
+        return observations[:, 0] * self.grid_size + observations[:, 1]
+
+    def act(self, observation):
+        """
+        Epsilon-greedy action for a single (row, col) observation.
+        """
+        if self._rng.random() < self.epsilon:
+            return self._rng.integer()
+        return int(self.q[self.state(observation)].argmax())
+
+    def act_batch(self, observations):
+        """
+        Epsilon-greedy actions for an (N, 2) array of observations.
+        """
+        return self.act_states(self.states(observations))
+
+    def act_states(self, states):
+        greedy = self.q[states].argmax(axis=1)
+        explore = self._rng.generator.random(len(states)) < self.epsilon
+        return np.where(explore, self._rng.integers(len(states)), greedy)
+
+    def action_probabilities(self, observations, n_actions=4):
+        """
+        Epsilon-greedy action distribution for an (N, 2) array of observations.
+        """
+        if self.n_actions > n_actions:
+            raise ValueError(f"Agent has {self.n_actions} actions, more than {n_actions}")
+        greedy = self.q[self.states(observations)].argmax(axis=1)
+        probs = np.zeros((len(greedy), n_actions))
+        probs[:, :self.n_actions] = self.epsilon / self.n_actions
+        probs[np.arange(len(greedy)), greedy] += 1.0 - self.epsilon
+        return probs
+
+    def greedy_policy(self):
+        """
+        :return: Int array of shape (n_states,) with the greedy action per state.
+        """
+        return self.q.argmax(axis=1)
+
+    @abstractmethod
+    def _next_values(self, next_states, next_actions):
+        """
+        Bootstrap value of each next state, e.g. max_a Q(s', a) for Q-learning.
+
+        :param next_states: Int array (B,) of flat states.
+        :param next_actions: Int array (B,) of the actions taken there, or None.
+        :return: Float array (B,).
+        """
+        pass
+
+    def update(self, state, action, reward, next_state, terminated, next_action=None):
+        """
+        Single-transition TD update on flat states.
+        """
+        target = reward
+        if not terminated:
+            target += self.gamma * self._next_values(np.array([next_state]),
+                                                     None if next_action is None else np.array([next_action]))[0]
+        self.q[state, action] += self.alpha * (target - self.q[state, action])
+
+    def update_batch(self, states, actions, rewards, next_states, terminated, next_actions=None):
+        """
+        Applies a batch of transitions at once. TD errors are computed from the current table and
+        scattered back with bincount. A (state, action) pair seen count times moves towards the mean of
+        its targets by 1 - (1 - alpha) ** count, the same as count sequential updates towards one target.
+        A batch of N envs sharing a start state therefore never overshoots, yet frequently visited pairs
+        still learn as fast as they would from N separate steps, so alpha does not depend on num_envs.
+
+        :param states: Int array (B,) of flat states.
+        :param actions: Int array (B,) of actions taken.
+        :param rewards: Float array (B,).
+        :param next_states: Int array (B,) of flat successor states.
+        :param terminated: Bool array (B,), no bootstrapping where True.
+        :param next_actions: Int array (B,) of the actions taken in next_states, needed by SARSA.
+        """
+        targets = rewards + self.gamma * np.where(terminated, 0.0, self._next_values(next_states, next_actions))
+        td_errors = targets - self.q[states, actions]
+        pairs, inverse = np.unique(states * self.n_actions + actions, return_inverse=True)
+        counts = np.bincount(inverse)
+        mean_td_errors = np.bincount(inverse, weights=td_errors) / counts
+        self.q.ravel()[pairs] += (1.0 - (1.0 - self.alpha) ** counts) * mean_td_errors
@@ -0,0 +1,36 @@
+import numpy as np
+
+def train_vectorized(agent, vec_env, n_steps, seed=None):
+    """
+    Trains a TabularAgent on a VectorGridWorldEnv, one batched update per vector step.
+
+    Truncated environments bootstrap from their final observation, terminated ones do not.
+    Repeated (state, action) pairs within a batch are weighted by their count, see TabularAgent.update_batch.
+
+    :param agent: A TabularAgent (QLearningAgent, SarsaAgent or ExpectedSarsaAgent).
+    :param vec_env: A VectorGridWorldEnv, or any env with the same batched reset/step interface.
+    :param n_steps: Number of vector steps, i.e. n_steps * num_envs transitions.
+    :param seed: Optional seed passed to vec_env.reset.
+    :return: Float array (n_steps,) with the mean reward per vector step.
+    """
+    observations, _ = vec_env.reset(seed=seed)
+    states = agent.states(observations)
+    actions = agent.act_states(states)
+    mean_rewards = np.zeros(n_steps)
+    for t in range(n_steps):
+        observations, rewards, terminated, truncated, info = vec_env.step(actions)
+        next_states = agent.states(observations)
+        next_actions = agent.act_states(next_states)
+
+        # Auto-reset replaced the successor of finished envs, bootstrap from where they actually ended
+        bootstrap_states = next_states
+        bootstrap_actions = next_actions
+        done = terminated | truncated
+        if np.any(done):
+            bootstrap_states = np.where(done, agent.states(info["final_observation"]), next_states)
+            bootstrap_actions = np.where(done, agent.act_states(bootstrap_states), next_actions)
+
+        agent.update_batch(states, actions, rewards, bootstrap_states, terminated, bootstrap_actions)
+        mean_rewards[t] = rewards.mean()
+        states, actions = next_states, next_actions
+    return mean_rewards
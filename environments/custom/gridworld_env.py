@@ -1,22 +1,36 @@
 import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
+from .tabular_mdp import transition_table, obstacle_occupancy
+
+# Text and RGB colour per render cell code: free, obstacle, target, agent
+RENDER_CHARS = np.array(['_', 'X', 'G', 'A'])
+RENDER_COLORS = np.array([[255, 255, 255], [64, 64, 64], [0, 200, 0], [0, 0, 255]], dtype=np.uint8)
+# Larger grids are printed as a window around the agent
+MAX_TEXT_RENDER_SIZE = 41
+# Fast-mode tables of grids up to this many states are converted to Python lists, larger ones stay numpy
+MAX_LIST_TABLE_STATES = 250_000
+
+
+class _TableView:
+    # Indexes a numpy table like the nested lists of fast mode, returning plain Python values
+    def __init__(self, array):
+        self.array = array
+
+    def __getitem__(self, state):
+        if self.array.ndim == 1:
+            return self.array.item(state)
+        return self.array[state].tolist()
 
 class GridWorldEnv(gym.Env): 
-    def __init__(self, size=4, start_pos=None, target_pos=None, obstacles=None):
+    def __init__(self, size=4, start_pos=None, target_pos=None, obstacles=None, fast=False):
         self.size = size
         assert start_pos is None or (0 <= start_pos[0] < size and 0 <= start_pos[1] < size), "Invalid start position"
         assert target_pos is None or (0 <= target_pos[0] < size and 0 <= target_pos[1] < size), "Invalid target position"
-        assert obstacles is None or all(0 <= obs[0] < size and 0 <= obs[1] < size for obs in obstacles), "Invalid obstacle positions"
         assert start_pos is None or not np.array_equal(start_pos, target_pos), "Start and target positions cannot be the same"
-        assert obstacles is None or not any(np.array_equal(obs, start_pos) for obs in obstacles), "Obstacles cannot overlap with start position"
-        assert obstacles is None or not any(np.array_equal(obs, target_pos) for obs in obstacles), "Obstacles cannot overlap with target position"
-        assert obstacles is None or len(obstacles) == len(set(map(tuple, obstacles))), "Obstacles must be unique"
-        
+
         super().__init__()
         self.start_pos = start_pos
-        self.target_pos = target_pos
-        self.obstacles = obstacles if obstacles is not None else []
 
         if self.start_pos is None:
             self.agent_pos = np.array([0, 0])
@@ -28,9 +42,19 @@ class GridWorldEnv(gym.Env):
         else:
             self.target_pos = np.array(target_pos)
 
-        self.obstacles = []
-        if obstacles:
-            self.obstacles = [np.array(obs) for obs in obstacles]
+        # Obstacles are kept both as a (size, size) occupancy grid and as a (K, 2) array of positions.
+        # Validation works on these arrays, so layouts with millions of cells are checked in a few
+        # vectorized passes. A bool array of shape (size, size) is taken as the occupancy grid itself.
+        self.occupancy = obstacle_occupancy(obstacles, size).copy()
+        if isinstance(obstacles, np.ndarray) and obstacles.dtype == bool:
+            self.obstacles = np.argwhere(self.occupancy)
+        else:
+            self.obstacles = np.zeros((0, 2), dtype=np.int64)
+            if obstacles is not None and len(obstacles) > 0:
+                self.obstacles = np.asarray(obstacles, dtype=np.int64).reshape(-1, 2)
+            assert np.count_nonzero(self.occupancy) == len(self.obstacles), "Obstacles must be unique"
+        assert start_pos is None or not self.occupancy[tuple(start_pos)], "Obstacles cannot overlap with start position"
+        assert not self.occupancy[tuple(self.target_pos)], "Obstacles cannot overlap with target position"
 
         # Define action space (essential for ANY agent)
         # 0: up, 1: down, 2: left, 3: right
@@ -49,9 +73,35 @@ class GridWorldEnv(gym.Env):
         # This is already part of the environment's definition (self.target_pos, self.obstacles, self.size).
         # The cheating agent will be implemented *outside* this class but will use this info.
 
+        # Fast mode: the state is a flat index row * size + col and every step is a table lookup.
+        # The observation array and info dict are reused between steps, so callers that keep
+        # them around must copy. agent_pos aliases the observation buffer in this mode.
+        # Up to MAX_LIST_TABLE_STATES states the tables are plain lists, since indexing them with Python
+        # ints is much cheaper than indexing numpy arrays. Larger grids keep numpy tables behind a
+        # _TableView, so setup stays fast at the cost of a few microseconds per step.
+        self.fast = fast
+        if fast:
+            next_state, reward, terminated = transition_table(self.size, self.target_pos, self.obstacles)
+            rows, cols = np.divmod(np.arange(self.size * self.size), self.size)
+            distance = np.hypot(rows - self.target_pos[0], cols - self.target_pos[1])
+            as_table = (lambda a: a.tolist()) if self.size * self.size <= MAX_LIST_TABLE_STATES else _TableView
+            self._next_state = as_table(next_state)
+            self._step_reward = as_table(reward)
+            self._step_terminated = as_table(terminated)
+            self._distance = as_table(distance)
+            self._obs_buffer = np.zeros(2, dtype=np.int32)
+            self._info = {"distance_to_goal": 0.0}
+            self.agent_pos = self._obs_buffer
+            self._set_state(int(self.agent_pos[0]) * self.size + int(self.agent_pos[1]))
+
     def reset(self, seed=None, options=None): 
         super().reset(seed=seed)
 
+        if self.fast:
+            start = (0, 0) if self.start_pos is None else self.start_pos
+            self._set_state(int(start[0]) * self.size + int(start[1]))
+            return self._obs_buffer, self._info
+
         if self.start_pos is None:
             self.agent_pos = np.array([0, 0])
         else:
@@ -62,6 +112,13 @@ class GridWorldEnv(gym.Env):
         return observation, info
 
     def step(self, action):
+        if self.fast:
+            if not 0 <= action < 4:
+                raise ValueError(f"Invalid action {action}")
+            state = self.state
+            self._set_state(self._next_state[state][action])
+            return self._obs_buffer, self._step_reward[state][action], self._step_terminated[state][action], False, self._info
+
         new_pos = self.agent_pos.copy()
         
         # --- Apply action ---
@@ -84,7 +141,7 @@ class GridWorldEnv(gym.Env):
         if terminated:
             reward += 1.0
 
-        if any(np.array_equal(new_pos, obs) for obs in self.obstacles):
+        if self.occupancy[new_pos[0], new_pos[1]]:
             # Optional: penalty for hitting an obstacle and maybe reset or stay put
             reward += -1.0
             # self.agent_pos = np.array([0,0]) # Example: reset on hitting obstacle
@@ -98,6 +155,24 @@ class GridWorldEnv(gym.Env):
 
         return observation, reward, terminated, truncated, info
 
+    def step_state(self, action):
+        """
+        Fast-mode step on flat states only. The observation buffer and info dict are not
+        refreshed until the next step, reset or render.
+
+        :param action: The action to take (0: up, 1: down, 2: left, 3: right).
+        :return: (state, reward, terminated) as plain Python values.
+        """
+        state = self.state
+        self.state = self._next_state[state][action]
+        return self.state, self._step_reward[state][action], self._step_terminated[state][action]
+
+    def _set_state(self, state):
+        # Keeps the flat state, the reused observation buffer and the info dict in sync
+        self.state = state
+        self._obs_buffer[0], self._obs_buffer[1] = divmod(state, self.size)
+        self._info["distance_to_goal"] = self._distance[state]
+
     def _get_obs(self):
         # The observation is the agent's current position
         return np.array(self.agent_pos, dtype=np.int32)
@@ -107,14 +182,39 @@ class GridWorldEnv(gym.Env):
         # Useful for debugging or for a "cheating" agent if it needs specific structured info.
         return {"distance_to_goal": np.linalg.norm(self.agent_pos - self.target_pos)}
 
-    def render(self, mode='human'): # Optional, but very useful for debugging
-        grid = np.full((self.size, self.size), '_', dtype=str)
-        for obs_pos in self.obstacles:
-            grid[tuple(obs_pos)] = 'X'
-        grid[tuple(self.target_pos)] = 'G'
-        grid[tuple(self.agent_pos)] = 'A'
-        print("\n".join(" ".join(row) for row in grid))
-        print("-"*(self.size*2-1))
+    def render(self, mode='human', radius=None):
+        """
+        Draws the grid, or only a window around the agent.
+
+        :param mode: 'human' prints the grid as text, 'rgb_array' returns it as an image.
+        :param radius: Draw the (2 * radius + 1)-wide window centred on the agent (clipped at the borders).
+            Defaults to the whole grid for 'rgb_array' and up to MAX_TEXT_RENDER_SIZE cells for 'human'.
+        :return: None for 'human', a uint8 array of shape (height, width, 3) for 'rgb_array'.
+        """
+        if self.fast:
+            self._set_state(self.state)
+        if mode not in ('human', 'rgb_array'):
+            raise ValueError(f"Unknown render mode {mode}")
+        if radius is None and mode == 'human' and self.size > MAX_TEXT_RENDER_SIZE:
+            radius = MAX_TEXT_RENDER_SIZE // 2
+
+        # Window bounds, the whole grid without a radius
+        row0, col0, row1, col1 = 0, 0, self.size, self.size
+        if radius is not None:
+            row, col = int(self.agent_pos[0]), int(self.agent_pos[1])
+            row0, col0 = max(row - radius, 0), max(col - radius, 0)
+            row1, col1 = min(row + radius + 1, self.size), min(col + radius + 1, self.size)
+
+        # Cell codes: 0 free, 1 obstacle, 2 target, 3 agent
+        cells = self.occupancy[row0:row1, col0:col1].astype(np.uint8)
+        for code, pos in ((2, self.target_pos), (3, self.agent_pos)):
+            if row0 <= pos[0] < row1 and col0 <= pos[1] < col1:
+                cells[pos[0] - row0, pos[1] - col0] = code
+
+        if mode == 'rgb_array':
+            return RENDER_COLORS[cells]
+        print("\n".join(" ".join(row) for row in RENDER_CHARS[cells]))
+        print("-"*((col1 - col0)*2-1))
 
     def close(self):
         pass
\ No newline at end of file
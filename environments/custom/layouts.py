@@ -0,0 +1,91 @@
+import numpy as np
+
+# Row/col offsets between neighbouring maze cells, in cell coordinates
+_CELL_STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def maze(size, seed=None):
+    """
+    Generates a perfect maze (exactly one path between any two free cells) with a seeded
+    randomized depth-first search.
+
+    Corridors run through the cells with even row and column, so the default start (0, 0) is
+    always free, as is the default target (size - 1, size - 1) for odd sizes. For even sizes the
+    last row and column are left open.
+
+    :param size: Side length of the square grid.
+    :param seed: Seed or np.random.Generator.
+    :return: Bool occupancy array of shape (size, size), True for walls.
+    """
+    rng = np.random.default_rng(seed)
+    occupancy = np.ones((size, size), dtype=bool)
+    n = (size + 1) // 2
+    visited = bytearray(n * n)
+    # One random neighbour order per cell, drawn in a single call
+    orders = np.argsort(rng.random((n * n, 4)), axis=1).tolist()
+
+    # Cell (r, c) is grid position (2r, 2c), the wall between two cells sits halfway
+    carved = [(0, 0)]
+    visited[0] = 1
+    stack = [(0, 0, 0)]
+    while stack:
+        row, col, k = stack.pop()
+        order = orders[row * n + col]
+        while k < 4:
+            d_row, d_col = _CELL_STEPS[order[k]]
+            k += 1
+            next_row, next_col = row + d_row, col + d_col
+            if 0 <= next_row < n and 0 <= next_col < n and not visited[next_row * n + next_col]:
+                visited[next_row * n + next_col] = 1
+                carved.append((2 * row + d_row, 2 * col + d_col))
+                carved.append((2 * next_row, 2 * next_col))
+                # Come back to the remaining neighbours once the new branch is exhausted
+                stack.append((row, col, k))
+                stack.append((next_row, next_col, 0))
+                break
+    carved = np.array(carved, dtype=np.int64)
+    occupancy[carved[:, 0], carved[:, 1]] = False
+    if size % 2 == 0:
+        occupancy[-1, :] = False
+        occupancy[:, -1] = False
+    return occupancy
+
+
+def random_obstacles(size, density, seed=None, free=None):
+    """
+    Places each obstacle independently with probability density. Reachability of the target is
+    not guaranteed.
+
+    :param size: Side length of the square grid.
+    :param density: Probability that a cell is an obstacle.
+    :param seed: Seed or np.random.Generator.
+    :param free: Iterable of (row, col) cells that are kept free, defaults to the default start
+        (0, 0) and target (size - 1, size - 1).
+    :return: Bool occupancy array of shape (size, size), True for obstacles.
+    """
+    rng = np.random.default_rng(seed)
+    occupancy = rng.random((size, size)) < density
+    if free is None:
+        free = [(0, 0), (size - 1, size - 1)]
+    free = np.asarray(free, dtype=np.int64).reshape(-1, 2)
+    occupancy[free[:, 0], free[:, 1]] = False
+    return occupancy
+
+
+def sample_obstacles(size, n_obstacles, seed=0):
+    """
+    Samples exactly n_obstacles distinct cells, never on the default start (0, 0) or target (size - 1, size - 1).
+
+    :return: List of (row, col) tuples.
+    """
+    rng = np.random.default_rng(seed)
+    free = np.arange(1, size * size - 1)
+    cells = rng.choice(free, size=min(n_obstacles, free.size), replace=False)
+    return [tuple(divmod(int(c), size)) for c in cells]
+
+
+def occupancy_to_obstacles(occupancy):
+    """
+    :return: Int array of shape (K, 2) with the (row, col) of every occupied cell, in row-major order.
+    """
+    return np.argwhere(occupancy)
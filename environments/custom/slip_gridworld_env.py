@@ -2,16 +2,31 @@ from ..custom.gridworld_env import GridWorldEnv
 import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
+from utils.buffered_rng import BufferedRNG
 
 class SlipGridWorldEnv(GridWorldEnv):
-    def __init__(self, size=4, start_pos=None, target_pos=None, obstacles=None, slip_prob=0.1):
-        super().__init__(size=size, start_pos=start_pos, target_pos=target_pos, obstacles=obstacles)
+    def __init__(self, size=4, start_pos=None, target_pos=None, obstacles=None, slip_prob=0.1, fast=False):
+        super().__init__(size=size, start_pos=start_pos, target_pos=target_pos, obstacles=obstacles, fast=fast)
         self.slip_prob = slip_prob  # Probability of slipping
+        # Slip draws come from the env's own np_random, so reset(seed=...) makes runs reproducible
+        self._slip_rng = BufferedRNG(self.np_random, int(self.action_space.n))
+
+    def reset(self, seed=None, options=None):
+        result = super().reset(seed=seed, options=options)
+        if seed is not None:
+            # Drop values pre-drawn from the old generator
+            self._slip_rng = BufferedRNG(self.np_random, int(self.action_space.n))
+        return result
 
     def step(self, action):
-        if np.random.rand() < self.slip_prob:
+        if self._slip_rng.random() < self.slip_prob:
             # Slip to a random action
-            action = self.action_space.sample()
+            action = self._slip_rng.integer()
 
         # Call the parent class's step method to execute the action
-        return super().step(action)
\ No newline at end of file
+        return super().step(action)
+
+    def step_state(self, action):
+        if self._slip_rng.random() < self.slip_prob:
+            action = self._slip_rng.integer()
+        return super().step_state(action)
\ No newline at end of file
@@ -0,0 +1,186 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+# Commands are single raw bytes over a pipe, so nothing is pickled per step
+_STEP, _RESET, _SEEDED_RESET, _CLOSE, _ACK = b's', b'r', b'R', b'c', b'k'
+
+
+def _buffer_specs(num_envs, obs_shape, obs_dtype):
+    return {
+        'observations': ((num_envs,) + tuple(obs_shape), obs_dtype),
+        'final_observations': ((num_envs,) + tuple(obs_shape), obs_dtype),
+        'actions': ((num_envs,), np.int64),
+        'rewards': ((num_envs,), np.float64),
+        'distances': ((num_envs,), np.float64),
+        'terminated': ((num_envs,), np.bool_),
+        'truncated': ((num_envs,), np.bool_),
+        'seeds': ((num_envs,), np.int64),
+    }
+
+
+def _aligned_nbytes(shape, dtype):
+    return -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 8) * 8
+
+
+def _map_buffers(buf, specs):
+    # Lays the arrays out back to back in one shared block, 8-byte aligned
+    arrays, offset = {}, 0
+    for name, (shape, dtype) in specs.items():
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+        offset += _aligned_nbytes(shape, dtype)
+    return arrays
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always tracks; workers share the parent's resource tracker, which keeps
+        # one entry per name, so the parent's unlink still cleans up exactly once
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker(conn, shm_name, specs, env_fns, start, max_steps):
+    shm = _attach(shm_name)
+    buffers = _map_buffers(shm.buf, specs)
+    envs = [env_fn() for env_fn in env_fns]
+    elapsed = np.zeros(len(envs), dtype=np.int64)
+    obs_buf, final_buf = buffers['observations'], buffers['final_observations']
+    actions, rewards, distances = buffers['actions'], buffers['rewards'], buffers['distances']
+    terminated, truncated, seeds = buffers['terminated'], buffers['truncated'], buffers['seeds']
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == _STEP:
+                for j, env in enumerate(envs):
+                    i = start + j
+                    observation, reward, term, trunc, info = env.step(int(actions[i]))
+                    elapsed[j] += 1
+                    trunc = bool(trunc) or (max_steps is not None and not term and elapsed[j] >= max_steps)
+                    rewards[i] = reward
+                    terminated[i] = term
+                    truncated[i] = trunc
+                    distances[i] = info.get('distance_to_goal', 0)
+                    if term or trunc:
+                        final_buf[i] = observation
+                        observation, _ = env.reset()
+                        elapsed[j] = 0
+                    obs_buf[i] = observation
+            elif command in (_RESET, _SEEDED_RESET):
+                for j, env in enumerate(envs):
+                    i = start + j
+                    seed = int(seeds[i]) if command == _SEEDED_RESET else None
+                    observation, info = env.reset(seed=seed)
+                    elapsed[j] = 0
+                    obs_buf[i] = observation
+                    distances[i] = info.get('distance_to_goal', 0)
+            elif command == _CLOSE:
+                break
+            conn.send_bytes(_ACK)
+    finally:
+        for env in envs:
+            env.close()
+        del obs_buf, final_buf, actions, rewards, distances, terminated, truncated, seeds, buffers
+        shm.close()
+        conn.close()
+
+
+class SubprocVectorGridWorldEnv:
+    def __init__(self, env_fns, num_workers=None, max_steps=None, context=None):
+        """
+        Vector env whose sub-environments live in worker processes and exchange all per-step data
+        through shared-memory numpy buffers.
+
+        Meant for GridWorldEnv subclasses whose step logic is costly and cannot be vectorized.
+        It exposes the same batched reset/step interface as VectorGridWorldEnv.
+
+        :param env_fns: List of picklable callables, each returning one environment.
+        :param num_workers: Number of worker processes, each owning a contiguous slice of the envs.
+            Defaults to min(len(env_fns), os.cpu_count()).
+        :param max_steps: Optional time limit per episode, after which an env is truncated.
+        :param context: Optional multiprocessing start method, e.g. 'fork' or 'spawn'.
+        """
+        self.num_envs = len(env_fns)
+        probe = env_fns[0]()
+        self.single_action_space = probe.action_space
+        self.single_observation_space = probe.observation_space
+        self.size = getattr(probe, 'size', None)
+        self.target_pos = getattr(probe, 'target_pos', None)
+        self.max_steps = max_steps
+        probe.close()
+
+        obs_space = self.single_observation_space
+        self._specs = _buffer_specs(self.num_envs, obs_space.shape, obs_space.dtype)
+        nbytes = sum(_aligned_nbytes(shape, dtype) for shape, dtype in self._specs.values())
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._buffers = _map_buffers(self._shm.buf, self._specs)
+
+        ctx = mp.get_context(context)
+        num_workers = min(num_workers or mp.cpu_count(), self.num_envs)
+        bounds = np.linspace(0, self.num_envs, num_workers + 1).astype(int)
+        self._conns, self._processes = [], []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(target=_worker, daemon=True,
+                                  args=(child_conn, self._shm.name, self._specs, env_fns[start:end], start, max_steps))
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+        self._closed = False
+
+    def _broadcast(self, command):
+        for conn in self._conns:
+            conn.send_bytes(command)
+        for conn in self._conns:
+            conn.recv_bytes()
+
+    def reset(self, seed=None, options=None):
+        """
+        Resets all envs. With a seed, env i is reset with seed + i.
+        """
+        if seed is not None:
+            self._buffers['seeds'][:] = seed + np.arange(self.num_envs)
+            self._broadcast(_SEEDED_RESET)
+        else:
+            self._broadcast(_RESET)
+        return self._buffers['observations'].copy(), {"distance_to_goal": self._buffers['distances'].copy()}
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Expected actions of shape ({self.num_envs},), got {actions.shape}")
+        self._buffers['actions'][:] = actions
+        self._broadcast(_STEP)
+
+        terminated = self._buffers['terminated'].copy()
+        truncated = self._buffers['truncated'].copy()
+        info = {"distance_to_goal": self._buffers['distances'].copy()}
+        done = terminated | truncated
+        if np.any(done):
+            info["final_observation"] = np.where(done[:, None], self._buffers['final_observations'],
+                                                 self._buffers['observations'])
+        info["_final_observation"] = done
+        return self._buffers['observations'].copy(), self._buffers['rewards'].copy(), terminated, truncated, info
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for conn in self._conns:
+            try:
+                conn.send_bytes(_CLOSE)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+        for conn in self._conns:
+            conn.close()
+        self._buffers = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def __del__(self):
+        if not getattr(self, '_closed', True):
+            self.close()
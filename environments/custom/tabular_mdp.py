@@ -0,0 +1,124 @@
+import numpy as np
+
+# Row/col offsets per action, same encoding as GridWorldEnv (0: up, 1: down, 2: left, 3: right)
+ACTION_DELTAS = np.array([[-1, 0], [1, 0], [0, -1], [0, 1]], dtype=np.int64)
+
+
+def obstacle_occupancy(obstacles, size):
+    """
+    Normalizes either obstacle format to a bool occupancy grid.
+
+    :param obstacles: None, an iterable or (K, 2) array of (row, col) positions, or a bool array of shape
+        (size, size) that is already an occupancy grid (as returned by environments.custom.layouts).
+    :param size: Side length of the square grid.
+    :return: Bool array of shape (size, size), True for obstacles. A given grid is returned as is.
+    """
+    if isinstance(obstacles, np.ndarray) and obstacles.dtype == bool:
+        assert obstacles.shape == (size, size), "Occupancy grid must have shape (size, size)"
+        return obstacles
+    occupancy = np.zeros((size, size), dtype=bool)
+    if obstacles is not None and len(obstacles) > 0:
+        obstacles = np.asarray(obstacles, dtype=np.int64).reshape(-1, 2)
+        assert np.all((obstacles >= 0) & (obstacles < size)), "Invalid obstacle positions"
+        occupancy[obstacles[:, 0], obstacles[:, 1]] = True
+    return occupancy
+
+
+def transition_table(size, target_pos, obstacles=None):
+    """
+    Builds the deterministic step tables of a gridworld over flat states s = row * size + col.
+
+    :param size: Side length of the square grid.
+    :param target_pos: (row, col) target position.
+    :param obstacles: Obstacle positions or occupancy grid, see obstacle_occupancy.
+    :return: (next_state, reward, terminated), each of shape (size * size, 4).
+    """
+    rows, cols = np.divmod(np.arange(size * size), size)
+    pos = np.stack([rows, cols], axis=1)
+
+    obstacle_mask = obstacle_occupancy(obstacles, size)
+
+    # (S, A, 2) clipped candidate positions
+    new_pos = np.clip(pos[:, None, :] + ACTION_DELTAS[None, :, :], 0, size - 1)
+    candidate = new_pos[..., 0] * size + new_pos[..., 1]
+
+    terminated = candidate == target_pos[0] * size + target_pos[1]
+    hit_obstacle = obstacle_mask[new_pos[..., 0], new_pos[..., 1]]
+    reward = -0.1 + terminated - hit_obstacle.astype(np.float64)
+
+    # Stay in place if hitting an obstacle
+    next_state = np.where(hit_obstacle, np.arange(size * size)[:, None], candidate)
+    return next_state, reward, terminated
+
+
+class TabularMDP:
+    def __init__(self, size, next_states, probs, rewards, terminal):
+        """
+        Sparse tabular model of a gridworld.
+
+        Each (s, a) pair has K possible successors: next_states[s, a, k] with probability probs[s, a, k].
+
+        :param size: Side length of the square grid.
+        :param next_states: Int array of shape (S, A, K) with successor states.
+        :param probs: Float array of shape (S, A, K) with successor probabilities.
+        :param rewards: Float array of shape (S, A) with expected immediate rewards.
+        :param terminal: Bool array of shape (S,), True for states that end the episode on arrival.
+        """
+        self.size = size
+        self.next_states = next_states
+        self.probs = probs
+        self.rewards = rewards
+        self.terminal = terminal
+        self.n_states, self.n_actions = rewards.shape
+
+    def expected_next(self, values, gamma=1.0):
+        """
+        Computes R[s, a] + gamma * sum_s' P[s, a, s'] * V[s'] for all (s, a), with V = 0 at terminal states.
+
+        :param values: Float array of shape (S,).
+        :param gamma: Discount factor.
+        :return: Float array of shape (S, A).
+        """
+        continuation = np.where(self.terminal, 0.0, values)
+        return self.rewards + gamma * np.einsum('sak,sak->sa', self.probs, continuation[self.next_states])
+
+    def dense_transitions(self):
+        """
+        Returns the full transition tensor P[s, a, s']. Only sensible for small grids.
+        """
+        P = np.zeros((self.n_states, self.n_actions, self.n_states))
+        s_idx = np.arange(self.n_states)[:, None, None]
+        a_idx = np.arange(self.n_actions)[None, :, None]
+        np.add.at(P, (s_idx, a_idx, self.next_states), self.probs)
+        return P
+
+
+def build_tabular_mdp(env):
+    """
+    Builds the tabular MDP of a GridWorldEnv or SlipGridWorldEnv.
+
+    With slip_prob p the intended action is executed with probability 1 - p and each of the
+    four actions with probability p / 4, exactly as in SlipGridWorldEnv.step.
+
+    :param env: The environment to model.
+    :return: A TabularMDP.
+    """
+    size = env.size
+    next_state, reward, _ = transition_table(size, env.target_pos, env.obstacles)
+    n_states, n_actions = reward.shape
+    slip_prob = getattr(env, 'slip_prob', 0.0)
+
+    if slip_prob > 0:
+        # Successor k is the outcome of action k, so the intended action keeps 1 - p + p / 4
+        next_states = np.ascontiguousarray(np.broadcast_to(next_state[:, None, :], (n_states, n_actions, n_actions)))
+        probs = np.full((n_states, n_actions, n_actions), slip_prob / n_actions)
+        probs[:, np.arange(n_actions), np.arange(n_actions)] += 1.0 - slip_prob
+        rewards = (1.0 - slip_prob) * reward + slip_prob * reward.mean(axis=1, keepdims=True)
+    else:
+        next_states = next_state[:, :, None]
+        probs = np.ones(next_states.shape)
+        rewards = reward
+
+    terminal = np.zeros(n_states, dtype=bool)
+    terminal[env.target_pos[0] * size + env.target_pos[1]] = True
+    return TabularMDP(size, next_states, probs, rewards, terminal)
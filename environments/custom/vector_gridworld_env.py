@@ -0,0 +1,129 @@
+import numpy as np
+from gymnasium import spaces
+from .tabular_mdp import ACTION_DELTAS, obstacle_occupancy
+
+
+class VectorGridWorldEnv:
+    def __init__(self, num_envs, size=4, start_pos=None, target_pos=None, obstacles=None,
+                 slip_prob=0.0, max_steps=None, seed=None):
+        """
+        Runs num_envs copies of the same gridworld as one set of numpy arrays.
+
+        Reward rules and action encoding are identical to GridWorldEnv / SlipGridWorldEnv:
+        -0.1 per step, +1.0 when reaching the target, -1.0 and stay put when moving onto an obstacle.
+        Environments that terminate (or hit max_steps) are reset to the start position automatically.
+
+        :param num_envs: Number of parallel environments.
+        :param size: Side length of the square grid.
+        :param start_pos: (row, col) start position, defaults to (0, 0).
+        :param target_pos: (row, col) target position, defaults to (size - 1, size - 1).
+        :param obstacles: Obstacle positions or occupancy grid, see tabular_mdp.obstacle_occupancy.
+        :param slip_prob: Probability that an action is replaced by a uniformly random one.
+        :param max_steps: Optional time limit per episode, after which an env is truncated.
+        :param seed: Seed for the slip random number generator.
+        """
+        assert num_envs > 0, "num_envs must be positive"
+        assert start_pos is None or (0 <= start_pos[0] < size and 0 <= start_pos[1] < size), "Invalid start position"
+        assert target_pos is None or (0 <= target_pos[0] < size and 0 <= target_pos[1] < size), "Invalid target position"
+
+        self.num_envs = num_envs
+        self.size = size
+        self.slip_prob = slip_prob
+        self.max_steps = max_steps
+
+        self.start_pos = np.array(start_pos if start_pos is not None else [0, 0], dtype=np.int64)
+        self.target_pos = np.array(target_pos if target_pos is not None else [size - 1, size - 1], dtype=np.int64)
+        assert not np.array_equal(self.start_pos, self.target_pos), "Start and target positions cannot be the same"
+
+        # Shared masks, indexed as mask[row, col]
+        self.obstacle_mask = obstacle_occupancy(obstacles, size).copy()
+        assert not self.obstacle_mask[tuple(self.start_pos)], "Obstacles cannot overlap with start position"
+        assert not self.obstacle_mask[tuple(self.target_pos)], "Obstacles cannot overlap with target position"
+        self.target_mask = np.zeros((size, size), dtype=bool)
+        self.target_mask[tuple(self.target_pos)] = True
+
+        self.single_action_space = spaces.Discrete(4)
+        self.single_observation_space = spaces.Box(
+            low=np.array([0, 0]),
+            high=np.array([size - 1, size - 1]),
+            dtype=np.int32
+        )
+        self.action_space = spaces.MultiDiscrete(np.full(num_envs, 4))
+        self.observation_space = spaces.Box(
+            low=0, high=size - 1, shape=(num_envs, 2), dtype=np.int32
+        )
+
+        self.np_random = np.random.default_rng(seed)
+        self.agent_pos = np.tile(self.start_pos, (num_envs, 1))
+        self.elapsed_steps = np.zeros(num_envs, dtype=np.int64)
+
+    @classmethod
+    def from_env(cls, env, num_envs, max_steps=None, seed=None):
+        """
+        Builds a vector env with the same layout as a scalar GridWorldEnv or SlipGridWorldEnv.
+
+        :param env: The scalar environment to copy the layout from.
+        :param num_envs: Number of parallel environments.
+        :param max_steps: Optional time limit per episode.
+        :param seed: Seed for the slip random number generator.
+        """
+        return cls(num_envs, size=env.size, start_pos=env.start_pos, target_pos=env.target_pos,
+                   obstacles=getattr(env, 'occupancy', env.obstacles), slip_prob=getattr(env, 'slip_prob', 0.0),
+                   max_steps=max_steps, seed=seed)
+
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.np_random = np.random.default_rng(seed)
+        self.agent_pos[:] = self.start_pos
+        self.elapsed_steps[:] = 0
+        return self._get_obs(), self._get_info(self.agent_pos)
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Expected actions of shape ({self.num_envs},), got {actions.shape}")
+        if np.any((actions < 0) | (actions > 3)):
+            raise ValueError(f"Invalid action in {actions}")
+
+        if self.slip_prob > 0:
+            slipped = self.np_random.random(self.num_envs) < self.slip_prob
+            actions = np.where(slipped, self.np_random.integers(0, 4, size=self.num_envs), actions)
+
+        # --- Apply actions, clipped to the grid ---
+        new_pos = np.clip(self.agent_pos + ACTION_DELTAS[actions], 0, self.size - 1)
+        rows, cols = new_pos[:, 0], new_pos[:, 1]
+
+        # --- Check for termination and calculate reward ---
+        terminated = self.target_mask[rows, cols]
+        hit_obstacle = self.obstacle_mask[rows, cols]
+        rewards = np.full(self.num_envs, -0.1) + terminated - hit_obstacle
+
+        # Stay in place if hitting an obstacle
+        new_pos[hit_obstacle] = self.agent_pos[hit_obstacle]
+        self.agent_pos = new_pos
+        self.elapsed_steps += 1
+
+        if self.max_steps is not None:
+            truncated = ~terminated & (self.elapsed_steps >= self.max_steps)
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+
+        info = self._get_info(self.agent_pos)
+        done = terminated | truncated
+        if np.any(done):
+            info["final_observation"] = self._get_obs()
+            self.agent_pos[done] = self.start_pos
+            self.elapsed_steps[done] = 0
+        info["_final_observation"] = done
+
+        return self._get_obs(), rewards, terminated, truncated, info
+
+    def _get_obs(self):
+        return self.agent_pos.astype(np.int32)
+
+    def _get_info(self, positions):
+        # Distances are those of the positions the step actually reached (before any auto-reset)
+        return {"distance_to_goal": np.linalg.norm(positions - self.target_pos, axis=1)}
+
+    def close(self):
+        pass
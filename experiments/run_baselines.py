@@ -1,144 +1,106 @@
-#%%
-git_path = '/home/alleinzell/LabRL_Implementations'
-import sys
-if git_path not in sys.path:
-    sys.path.append(git_path)
-from environments.custom.gridworld_env import GridWorldEnv
-from environments.custom.slip_gridworld_env import SlipGridWorldEnv
-from agents.baseline.random_agent import RandomAgent
-from agents.baseline.cheating_agent import CheatingAgent
-from utils.plot_reward_histories import plot_reward_histories
-from utils.run_agent import run_agent
-from utils.plot_distances import plot_distances
+"""
+Runs the baseline agents on the gridworld environments.
 
-import numpy as np
-import gymnasium as gym
-from gymnasium import spaces
-import time
+    python -m experiments.run_baselines --output results/
+    python -m experiments.run_baselines --env SlipGridWorldEnv --agent random cheating --seeds 0 1 2 --no-plot
+
+Results are written to <output>/summary.npz. Plotting (matplotlib) and progress bars (tqdm) are only
+imported when requested, so batch jobs with --no-plot start quickly.
+"""
 import argparse
-import logging
-from tqdm import tqdm
-
-#%%
-
-grid_size = 5
-target = (grid_size - 1, grid_size - 1)
-start = (grid_size - 1, 0)
-obstacles = [(grid_size -1, j) for j in range(1, grid_size - 1)]
-
-env = GridWorldEnv(size=grid_size, target_pos=target, start_pos=start, obstacles=obstacles)
-random_agent = RandomAgent(env.action_space)
-cheating_agent = CheatingAgent(target_pos=target, grid_size=grid_size, obstacles=obstacles)
-
-#%% running random agent
-reward_histories = []
-total_rewards = []
-distance_history = []
-num_episodes = 100
-min_steps = 100
-for i in tqdm(range(num_episodes), desc="Running Random Agent Episodes"):
-    total_reward, reward_history, distances = run_agent(random_agent, env, max_steps=100, min_steps=min_steps, render=False)
-    reward_histories.append(reward_history)
-    total_rewards.append(total_reward)
-    distance_history.append(distances)
-
-lens = [len(r) for r in reward_histories]
-# Normalize the reward histories to the maximum length
-max_len = max(lens)
-reward_histories = [np.pad(r, (0, max_len - len(r)), 'constant', constant_values=0) for r in reward_histories]
-reward_histories = np.stack(reward_histories)
-
-lens = [len(r) for r in distance_history]
-# Normalize the reward histories to the maximum length
-max_len = max(lens)
-distance_history = [np.pad(r, (0, max_len - len(r)), 'constant', constant_values=0) for r in distance_history]
-distance_history = np.stack(distance_history)
-fig, axs = plot_reward_histories(reward_histories)
-fig, axs = plot_distances(distance_history)
-
-#%% running cheating agent
-reward_histories = []
-total_rewards = []
-distance_history = []
-
-num_episodes = 100
-min_steps = 100
-
-for i in tqdm(range(num_episodes), desc="Running Random Agent Episodes"):
-    total_reward, reward_history, distances = run_agent(cheating_agent, env, max_steps=100, min_steps=min_steps, render=False)
-    reward_histories.append(reward_history)
-    total_rewards.append(total_reward)
-    distance_history.append(distances)
-
-lens = [len(r) for r in reward_histories]
-# Normalize the reward histories to the maximum length
-max_len = max(lens)
-reward_histories = [np.pad(r, (0, max_len - len(r)), 'constant', constant_values=0) for r in reward_histories]
-reward_histories = np.stack(reward_histories)
-lens = [len(r) for r in distance_history]
-# Normalize the reward histories to the maximum length
-max_len = max(lens)
-distance_history = [np.pad(r, (0, max_len - len(r)), 'constant', constant_values=0) for r in distance_history]
-distance_history = np.stack(distance_history)
-fig, axs = plot_reward_histories(reward_histories)
-fig, axs = plot_distances(distance_history)
-# %% Slip
-
-env = SlipGridWorldEnv(size=grid_size, target_pos=target, start_pos=start, obstacles=obstacles, slip_prob=0.75)
-random_agent = RandomAgent(env.action_space)
-cheating_agent = CheatingAgent(target_pos=target, grid_size=grid_size, obstacles=obstacles)
-
-#%% running random agent
-reward_histories = []
-total_rewards = []
-distance_history = []
-num_episodes = 100
-min_steps = 100
-for i in tqdm(range(num_episodes), desc="Running Random Agent Episodes"):
-    total_reward, reward_history, distances = run_agent(random_agent, env, max_steps=100, min_steps=min_steps, render=False)
-    reward_histories.append(reward_history)
-    total_rewards.append(total_reward)
-    distance_history.append(distances)
-
-lens = [len(r) for r in reward_histories]
-# Normalize the reward histories to the maximum length
-max_len = max(lens)
-reward_histories = [np.pad(r, (0, max_len - len(r)), 'constant', constant_values=0) for r in reward_histories]
-reward_histories = np.stack(reward_histories)
-
-lens = [len(r) for r in distance_history]
-# Normalize the reward histories to the maximum length
-max_len = max(lens)
-distance_history = [np.pad(r, (0, max_len - len(r)), 'constant', constant_values=0) for r in distance_history]
-distance_history = np.stack(distance_history)
-fig, axs = plot_reward_histories(reward_histories)
-fig, axs = plot_distances(distance_history)
-
-#%% running cheating agent
-reward_histories = []
-total_rewards = []
-distance_history = []
-
-num_episodes = 100
-min_steps = 100
-
-for i in tqdm(range(num_episodes), desc="Running Random Agent Episodes"):
-    total_reward, reward_history, distances = run_agent(cheating_agent, env, max_steps=100, min_steps=min_steps, render=False)
-    reward_histories.append(reward_history)
-    total_rewards.append(total_reward)
-    distance_history.append(distances)
-
-lens = [len(r) for r in reward_histories]
-# Normalize the reward histories to the maximum length
-max_len = max(lens)
-reward_histories = [np.pad(r, (0, max_len - len(r)), 'constant', constant_values=0) for r in reward_histories]
-reward_histories = np.stack(reward_histories)
-lens = [len(r) for r in distance_history]
-# Normalize the reward histories to the maximum length
-max_len = max(lens)
-distance_history = [np.pad(r, (0, max_len - len(r)), 'constant', constant_values=0) for r in distance_history]
-distance_history = np.stack(distance_history)
-fig, axs = plot_reward_histories(reward_histories)
-fig, axs = plot_distances(distance_history)
-
-# %%
+import json
+import os
+import sys
+import numpy as np
+
+from experiments.sweep import AGENTS, ENVS, LAYOUTS, expand_grid, run_sweep
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run baseline agents on gridworld environments.")
+    parser.add_argument('--env', nargs='+', default=['GridWorldEnv', 'SlipGridWorldEnv'], choices=sorted(ENVS))
+    parser.add_argument('--agent', nargs='+', default=['random', 'cheating'], choices=sorted(AGENTS))
+    parser.add_argument('--size', type=int, default=5, help="Side length of the grid.")
+    parser.add_argument('--layout', default='bottom_wall', choices=sorted(LAYOUTS), help="Obstacle layout.")
+    parser.add_argument('--layout-seed', type=int, default=0, help="Seed of generated layouts such as maze.")
+    parser.add_argument('--slip-prob', type=float, default=0.75, help="Slip probability of SlipGridWorldEnv.")
+    parser.add_argument('--episodes', type=int, default=100, help="Episodes per run, the budget with --target-width.")
+    parser.add_argument('--target-width', type=float, default=None,
+                        help="Stop once the 95%% confidence interval of the mean return is this wide.")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0])
+    parser.add_argument('--max-steps', type=int, default=100)
+    parser.add_argument('--min-steps', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes, defaults to all cores.")
+    parser.add_argument('--cache-dir', default='.sweep_cache')
+    parser.add_argument('--output', default='results', help="Directory for summary.npz and figures.")
+    parser.add_argument('--no-plot', action='store_true', help="Only write summary arrays, never import matplotlib.")
+    parser.add_argument('--show', action='store_true', help="Open plot windows instead of only saving figures.")
+    parser.add_argument('--progress', action='store_true', help="Show a tqdm progress bar.")
+    return parser.parse_args(argv)
+
+
+def write_summary(path, results):
+    """
+    Stacks the per-configuration statistics into one .npz file.
+    """
+    n_steps = max(stats.rewards.num_steps for _, stats in results)
+
+    def padded(values):
+        return np.pad(values, (0, n_steps - len(values)))
+
+    np.savez(path,
+             configs=np.array(json.dumps([config for config, _ in results])),
+             n_episodes=np.array([stats.n_episodes for _, stats in results]),
+             return_mean=np.array([stats.return_mean for _, stats in results]),
+             return_std=np.sqrt([stats.return_variance for _, stats in results]),
+             reward_mean=np.stack([padded(stats.rewards.padded_mean()) for _, stats in results]),
+             distance_mean=np.stack([padded(stats.distances.padded_mean()) for _, stats in results]))
+
+
+def plot_results(results, output, show):
+    import matplotlib
+    if not show:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from utils.plot_reward_histories import plot_reward_histories
+    from utils.plot_distances import plot_distances
+
+    for config, stats in results:
+        name = f"{config['env']}_{config['agent']}_seed{config['seed']}"
+        fig, axs = plot_reward_histories(stats, save_path=os.path.join(output, f'{name}_rewards.png'), show=show)
+        plt.close(fig)
+        fig, axs = plot_distances(stats, save_path=os.path.join(output, f'{name}_distances.png'), show=show)
+        plt.close(fig)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    base_config = {
+        'size': args.size,
+        'target': (args.size - 1, args.size - 1),
+        'start': (args.size - 1, 0),
+        'obstacles': args.layout,
+        'layout_seed': args.layout_seed,
+        'slip_prob': args.slip_prob, # only used by SlipGridWorldEnv
+        'episodes': args.episodes,
+        'target_width': args.target_width,
+        'max_steps': args.max_steps,
+        'min_steps': args.min_steps,
+    }
+    configs = expand_grid(base_config, env=args.env, agent=args.agent, seed=args.seeds)
+    # Only configurations without a cached result are computed
+    results = run_sweep(configs, cache_dir=args.cache_dir, workers=args.workers, progress=args.progress)
+
+    os.makedirs(args.output, exist_ok=True)
+    write_summary(os.path.join(args.output, 'summary.npz'), results)
+    for config, stats in results:
+        low, high = stats.return_confidence_interval()
+        print(f"{config['env']:<18} {config['agent']:<14} seed={config['seed']:<4} "
+              f"mean return {stats.return_mean:.3f} over {stats.n_episodes} episodes, 95% CI [{low:.3f}, {high:.3f}]")
+    if not args.no_plot:
+        plot_results(results, args.output, args.show)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Performance benchmarks for environments, agents and the episode runner.
+
+    python -m experiments.run_benchmarks --output bench.json
+    python -m experiments.run_benchmarks --output bench.json --baseline baseline.json --tolerance 0.2
+
+Every result is stored with whether higher is better, so a later run can be compared against a stored
+baseline. The process exits with status 1 if any benchmark regressed by more than the tolerance.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import numpy as np
+
+from environments.custom.gridworld_env import GridWorldEnv
+from environments.custom.slip_gridworld_env import SlipGridWorldEnv
+from environments.custom.layouts import sample_obstacles
+from agents.baseline.random_agent import RandomAgent
+from agents.baseline.cheating_agent import CheatingAgent
+from utils.run_agent import run_agent
+
+
+def _best_time(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_env_steps(env, n_steps, repeats):
+    actions = np.random.default_rng(0).integers(0, 4, size=n_steps).tolist()
+
+    def run():
+        env.reset(seed=0)
+        for action in actions:
+            _, _, terminated, _, _ = env.step(action)
+            if terminated:
+                env.reset()
+
+    return n_steps / _best_time(run, repeats)
+
+
+def bench_act_latency(agent, observations, repeats):
+    agent.act(observations[0])  # warm-up, builds any lazy tables
+
+    def run():
+        for observation in observations:
+            agent.act(observation)
+
+    return _best_time(run, repeats) / len(observations) * 1e6
+
+
+def bench_episodes(agent, env, n_episodes, max_steps, repeats):
+    def run():
+        for _ in range(n_episodes):
+            run_agent(agent, env, max_steps=max_steps)
+
+    return n_episodes / _best_time(run, repeats)
+
+
+def run_benchmarks(sizes=(5, 50, 500), obstacle_counts=(0, 10, 100), n_steps=20000, n_acts=5000, n_episodes=200,
+                   repeats=3):
+    """
+    Runs all benchmarks.
+
+    :return: Dict mapping benchmark name to {'value', 'unit', 'higher_is_better'}.
+    """
+    results = {}
+
+    def record(name, value, unit, higher_is_better):
+        results[name] = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+        print(f"{name:<60} {value:>14.2f} {unit}")
+
+    for size in sizes:
+        for n_obstacles in obstacle_counts:
+            if n_obstacles >= size * size - 2:
+                continue
+            obstacles = sample_obstacles(size, n_obstacles)
+            for env_cls in (GridWorldEnv, SlipGridWorldEnv):
+                for fast in (False, True):
+                    env = env_cls(size=size, obstacles=obstacles, fast=fast)
+                    mode = 'fast' if fast else 'default'
+                    record(f"env_steps/{env_cls.__name__}/{mode}/size={size}/obstacles={n_obstacles}",
+                           bench_env_steps(env, n_steps, repeats), 'steps/s', True)
+
+    for size in sizes:
+        for n_obstacles in obstacle_counts:
+            if n_obstacles >= size * size - 2:
+                continue
+            obstacles = sample_obstacles(size, n_obstacles)
+            env = GridWorldEnv(size=size, obstacles=obstacles)
+            observations = np.random.default_rng(0).integers(0, size, size=(n_acts, 2))
+            agents = {
+                'RandomAgent': RandomAgent(env.action_space),
+                'CheatingAgent/greedy': CheatingAgent(env.target_pos, size, obstacles),
+                'CheatingAgent/bfs': CheatingAgent(env.target_pos, size, obstacles, mode='bfs'),
+            }
+            for name, agent in agents.items():
+                record(f"act_latency/{name}/size={size}/obstacles={n_obstacles}",
+                       bench_act_latency(agent, observations, repeats), 'us/call', False)
+
+    size = 5
+    obstacles = [(size - 1, j) for j in range(1, size - 1)]
+    for env_cls in (GridWorldEnv, SlipGridWorldEnv):
+        env = env_cls(size=size, start_pos=(size - 1, 0), obstacles=obstacles)
+        for name, agent in (('RandomAgent', RandomAgent(env.action_space)),
+                            ('CheatingAgent', CheatingAgent(env.target_pos, size, obstacles))):
+            record(f"episodes/{env_cls.__name__}/{name}/size={size}",
+                   bench_episodes(agent, env, n_episodes, 100, repeats), 'episodes/s', True)
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results against a baseline and returns the names of regressed benchmarks.
+
+    :param tolerance: Allowed relative slowdown, e.g. 0.2 for 20%.
+    """
+    regressions = []
+    for name, entry in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]['value'], entry['value']
+        if entry['higher_is_better']:
+            change = new / old - 1.0
+            regressed = new < old * (1.0 - tolerance)
+        else:
+            change = old / new - 1.0
+            regressed = new > old * (1.0 + tolerance)
+        flag = 'REGRESSION' if regressed else 'ok'
+        print(f"{name:<60} {change:>+8.1%} {flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark env step rate, agent act latency and episode throughput.")
+    parser.add_argument('--output', default='bench_results.json', help="Where to write the JSON results.")
+    parser.add_argument('--baseline', default=None, help="JSON results of an earlier run to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown before flagging.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5, 50, 500])
+    parser.add_argument('--obstacles', type=int, nargs='+', default=[0, 10, 100])
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--quick', action='store_true', help="Fewer steps and repeats, for smoke tests.")
+    args = parser.parse_args(argv)
+
+    scale = 10 if args.quick else 1
+    results = run_benchmarks(sizes=args.sizes, obstacle_counts=args.obstacles, n_steps=20000 // scale,
+                             n_acts=5000 // scale, n_episodes=200 // scale,
+                             repeats=1 if args.quick else args.repeats)
+    with open(args.output, 'w') as f:
+        json.dump({'python': platform.python_version(), 'numpy': np.__version__,
+                   'machine': platform.machine(), 'results': results}, f, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
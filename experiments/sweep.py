@@ -0,0 +1,277 @@
+"""
+Declarative experiment sweeps with an on-disk, content-addressed result cache.
+
+A configuration is a plain dict, e.g.
+
+    {'env': 'SlipGridWorldEnv', 'size': 5, 'start': (4, 0), 'target': (4, 4), 'obstacles': 'bottom_wall',
+     'slip_prob': 0.75, 'agent': 'cheating', 'episodes': 100, 'seed': 0, 'max_steps': 100, 'min_steps': 100}
+
+'obstacles' is a list of positions or the name of a layout in LAYOUTS, seeded by 'layout_seed' for mazes.
+
+With 'target_width' set, 'episodes' becomes a budget and episodes are only run until the confidence
+interval of the mean return is that narrow, see utils.run_agent.run_until_confident.
+
+Each result is stored under a hash of its normalized configuration plus a hash of the source code, so
+re-running a sweep only computes configurations (or code) that changed.
+"""
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache, partial
+import numpy as np
+
+from environments.custom.gridworld_env import GridWorldEnv
+from environments.custom.slip_gridworld_env import SlipGridWorldEnv
+from environments.custom.layouts import maze, random_obstacles
+from agents.baseline.random_agent import RandomAgent
+from agents.baseline.cheating_agent import CheatingAgent
+from agents.planning.planning_agent import PlanningAgent
+from utils.run_agent import run_episodes, run_until_confident
+from utils.step_statistics import EpisodeStatistics
+
+ENVS = {
+    'GridWorldEnv': GridWorldEnv,
+    'SlipGridWorldEnv': SlipGridWorldEnv,
+}
+
+DEFAULT_CONFIG = {
+    'env': 'GridWorldEnv',
+    'size': 5,
+    'start': None,
+    'target': None,
+    'obstacles': None,
+    'layout_seed': 0,
+    'slip_prob': 0.0,
+    'agent': 'random',
+    'episodes': 100,
+    'target_width': None,
+    'seed': 0,
+    'max_steps': 100,
+    'min_steps': 1,
+}
+
+# Source directories whose contents define the code version
+_CODE_DIRS = ('agents', 'environments', 'utils')
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def no_obstacles(size, seed=None):
+    return []
+
+
+def bottom_wall(size, seed=None):
+    """
+    Obstacles along the bottom row except both corners, the layout used in run_baselines.
+    """
+    return [(size - 1, j) for j in range(1, size - 1)]
+
+
+def random_layout(size, seed=None):
+    """
+    Each cell is an obstacle with probability 0.2, except the default start and target. The target may be unreachable.
+    """
+    return random_obstacles(size, 0.2, seed)
+
+
+# Named layouts take (size, seed) and return obstacle positions or a bool occupancy grid, whose start
+# and target cells are cleared when the env is built. Configs keep the name, so the cache key stays
+# small and large grids are only generated when an env is built.
+LAYOUTS = {
+    'none': no_obstacles,
+    'bottom_wall': bottom_wall,
+    'maze': maze,
+    'random': random_layout,
+}
+# Layouts whose result depends on layout_seed
+SEEDED_LAYOUTS = {'maze', 'random'}
+
+
+def make_random_agent(env):
+    return RandomAgent(env.action_space)
+
+
+def make_cheating_agent(env):
+    return CheatingAgent(target_pos=env.target_pos, grid_size=env.size, obstacles=env.obstacles)
+
+
+def make_cheating_bfs_agent(env):
+    return CheatingAgent(target_pos=env.target_pos, grid_size=env.size, obstacles=env.obstacles, mode='bfs')
+
+
+def make_planning_agent(env):
+    return PlanningAgent(env)
+
+
+AGENTS = {
+    'random': make_random_agent,
+    'cheating': make_cheating_agent,
+    'cheating_bfs': make_cheating_bfs_agent,
+    'planning': make_planning_agent,
+}
+
+
+def normalize_config(config):
+    """
+    Fills in defaults and canonicalizes values, so equal experiments hash equally. Named layouts are kept
+    as names, keyed together with size and layout_seed.
+    """
+    unknown = set(config) - set(DEFAULT_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown config keys {sorted(unknown)}")
+    config = {**DEFAULT_CONFIG, **config}
+    if config['env'] not in ENVS:
+        raise ValueError(f"Unknown env {config['env']}")
+    if config['agent'] not in AGENTS:
+        raise ValueError(f"Unknown agent {config['agent']}")
+    obstacles = config['obstacles']
+    if isinstance(obstacles, str):
+        if obstacles not in LAYOUTS:
+            raise ValueError(f"Unknown layout {obstacles}")
+        config['obstacles'] = None if obstacles == 'none' else obstacles
+    else:
+        if isinstance(obstacles, np.ndarray) and obstacles.dtype == bool:
+            obstacles = np.argwhere(obstacles)
+        if obstacles is None or len(obstacles) == 0:
+            config['obstacles'] = None
+        else:
+            config['obstacles'] = [list(map(int, obs)) for obs in obstacles]
+    if not (isinstance(config['obstacles'], str) and config['obstacles'] in SEEDED_LAYOUTS):
+        config['layout_seed'] = 0
+    for key in ('start', 'target'):
+        if config[key] is not None:
+            config[key] = list(map(int, config[key]))
+    if config['env'] != 'SlipGridWorldEnv':
+        config['slip_prob'] = 0.0
+    return config
+
+
+def expand_grid(base=None, **axes):
+    """
+    Cartesian product of configurations, e.g. expand_grid({'size': 5}, agent=['random', 'cheating'], seed=[0, 1]).
+    """
+    base = base or {}
+    keys = list(axes)
+    return [{**base, **dict(zip(keys, values))} for values in itertools.product(*(axes[k] for k in keys))]
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """
+    Hash of every .py file under agents/, environments/ and utils/, plus this module.
+    """
+    digest = hashlib.sha256()
+    paths = [os.path.abspath(__file__)]
+    for directory in _CODE_DIRS:
+        for root, _, files in os.walk(os.path.join(_REPO_ROOT, directory)):
+            paths.extend(os.path.join(root, f) for f in files if f.endswith('.py'))
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, _REPO_ROOT).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def config_hash(config):
+    config = normalize_config(config)
+    payload = json.dumps(config, sort_keys=True) + code_version()
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _make_env(config):
+    obstacles = config['obstacles']
+    if isinstance(obstacles, str):
+        obstacles = LAYOUTS[obstacles](config['size'], config['layout_seed'])
+        if isinstance(obstacles, np.ndarray):
+            # Generated grids never block the configured start and target
+            size = config['size']
+            for pos in (config['start'] or (0, 0), config['target'] or (size - 1, size - 1)):
+                obstacles[pos[0], pos[1]] = False
+    kwargs = dict(size=config['size'], start_pos=config['start'], target_pos=config['target'], obstacles=obstacles)
+    if config['env'] == 'SlipGridWorldEnv':
+        kwargs['slip_prob'] = config['slip_prob']
+    return ENVS[config['env']](**kwargs)
+
+
+def make_env_factory(config):
+    """
+    :return: Picklable callable building the configured env. Named layouts are generated when it is called,
+        i.e. once per worker.
+    """
+    return partial(_make_env, normalize_config(config))
+
+
+def run_config(config):
+    """
+    Runs one configuration in-process.
+
+    :return: EpisodeStatistics over config['episodes'] episodes, or over fewer if config['target_width'] is
+        reached earlier.
+    """
+    config = normalize_config(config)
+    if config['target_width'] is not None:
+        stats, _ = run_until_confident(AGENTS[config['agent']], make_env_factory(config), config['target_width'],
+                                       max_episodes=config['episodes'], workers=1, seed=config['seed'],
+                                       max_steps=config['max_steps'], min_steps=config['min_steps'])
+        return stats
+    return run_episodes(AGENTS[config['agent']], make_env_factory(config), config['episodes'], workers=1,
+                        seed=config['seed'], max_steps=config['max_steps'], min_steps=config['min_steps'],
+                        streaming=True)
+
+
+def _cache_path(cache_dir, config):
+    return os.path.join(cache_dir, f'{config_hash(config)}.npz')
+
+
+def _save(path, config, stats):
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path, config=np.array(json.dumps(normalize_config(config), sort_keys=True)), **stats.to_arrays())
+    os.replace(tmp_path, path)
+
+
+def _load(path):
+    with np.load(path) as data:
+        return EpisodeStatistics.from_arrays(data)
+
+
+def run_sweep(configs, cache_dir='.sweep_cache', workers=None, progress=False):
+    """
+    Runs every configuration that has no cached result, spread over a process pool, and loads the rest.
+
+    :param configs: List of configuration dicts, see DEFAULT_CONFIG.
+    :param cache_dir: Directory holding one .npz per (configuration, code version).
+    :param workers: Number of worker processes, defaults to os.cpu_count(). 1 runs in-process.
+    :param progress: Show a tqdm progress bar over the computed configurations.
+    :return: List of (normalized config, EpisodeStatistics) in the order of configs.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    configs = [normalize_config(config) for config in configs]
+    paths = [_cache_path(cache_dir, config) for config in configs]
+    # Identical configurations are computed once
+    missing = {path: config for path, config in zip(paths, configs) if not os.path.exists(path)}
+
+    if missing:
+        workers = workers or os.cpu_count() or 1
+        bar = None
+        if progress:
+            from tqdm import tqdm
+            bar = tqdm(total=len(missing), desc="Running sweep")
+        if workers == 1:
+            for path, config in missing.items():
+                _save(path, config, run_config(config))
+                if bar is not None:
+                    bar.update()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(run_config, config): (path, config) for path, config in missing.items()}
+                # Save as results arrive, so an interrupted sweep keeps its finished cells
+                for future in as_completed(futures):
+                    path, config = futures[future]
+                    _save(path, config, future.result())
+                    if bar is not None:
+                        bar.update()
+        if bar is not None:
+            bar.close()
+
+    return [(config, _load(path)) for config, path in zip(configs, paths)]
@@ -0,0 +1,54 @@
+import numpy as np
+
+class BufferedRNG:
+    def __init__(self, generator=None, high=4, block_size=4096):
+        """
+        Hands out uniforms and integers in [0, high) one at a time from large pre-drawn blocks.
+
+        Drawing a block with one numpy call and indexing into a Python list is far cheaper per value
+        than calling the generator for every scalar. All values come from the given generator, so a
+        seeded generator gives a reproducible stream.
+
+        :param generator: A np.random.Generator or a seed for np.random.default_rng.
+        :param high: Exclusive upper bound of the integers.
+        :param block_size: Number of values drawn per refill.
+        """
+        if not isinstance(generator, np.random.Generator):
+            generator = np.random.default_rng(generator)
+        self.generator = generator
+        self.high = high
+        self.block_size = block_size
+        self._uniforms = []
+        self._uniform_pos = 0
+        self._integers = []
+        self._integer_pos = 0
+
+    def random(self):
+        """
+        :return: A float in [0, 1).
+        """
+        i = self._uniform_pos
+        if i == len(self._uniforms):
+            self._uniforms = self.generator.random(self.block_size).tolist()
+            i = 0
+        self._uniform_pos = i + 1
+        return self._uniforms[i]
+
+    def integer(self):
+        """
+        :return: An int in [0, high).
+        """
+        i = self._integer_pos
+        if i == len(self._integers):
+            self._integers = self.generator.integers(0, self.high, size=self.block_size).tolist()
+            i = 0
+        self._integer_pos = i + 1
+        return self._integers[i]
+
+    def integers(self, n):
+        """
+        Draws n integers in [0, high) with one generator call, bypassing the scalar buffer.
+
+        :return: Int array of shape (n,).
+        """
+        return self.generator.integers(0, self.high, size=n)
@@ -0,0 +1,114 @@
+import time
+
+class Callback:
+    """
+    Base class for run_agent hooks. Override only the hooks you need, the rest are no-ops.
+    """
+    def on_reset(self, observation, info):
+        pass
+
+    def before_act(self, observation):
+        pass
+
+    def after_act(self, observation, action):
+        pass
+
+    def before_step(self, action):
+        pass
+
+    def after_step(self, observation, reward, terminated, truncated, info):
+        pass
+
+    def on_episode_end(self, total_reward, step_count):
+        pass
+
+
+class CallbackList(Callback):
+    def __init__(self, callbacks):
+        """
+        Dispatches every hook to a list of callbacks, in order.
+
+        :param callbacks: A Callback or an iterable of Callbacks.
+        """
+        if isinstance(callbacks, Callback):
+            callbacks = [callbacks]
+        self.callbacks = list(callbacks)
+
+    def __len__(self):
+        return len(self.callbacks)
+
+    def on_reset(self, observation, info):
+        for callback in self.callbacks:
+            callback.on_reset(observation, info)
+
+    def before_act(self, observation):
+        for callback in self.callbacks:
+            callback.before_act(observation)
+
+    def after_act(self, observation, action):
+        for callback in self.callbacks:
+            callback.after_act(observation, action)
+
+    def before_step(self, action):
+        for callback in self.callbacks:
+            callback.before_step(action)
+
+    def after_step(self, observation, reward, terminated, truncated, info):
+        for callback in self.callbacks:
+            callback.after_step(observation, reward, terminated, truncated, info)
+
+    def on_episode_end(self, total_reward, step_count):
+        for callback in self.callbacks:
+            callback.on_episode_end(total_reward, step_count)
+
+
+class ProfilerCallback(Callback):
+    def __init__(self):
+        """
+        Accumulates wall time spent in agent.act, env.step and the rest of the episode loop.
+        """
+        self.act_time = 0.0
+        self.step_time = 0.0
+        self.episode_time = 0.0
+        self.steps = 0
+        self.episodes = 0
+        self._start = 0.0
+        self._episode_start = 0.0
+
+    def on_reset(self, observation, info):
+        self._episode_start = time.perf_counter()
+
+    def before_act(self, observation):
+        self._start = time.perf_counter()
+
+    def after_act(self, observation, action):
+        self.act_time += time.perf_counter() - self._start
+
+    def before_step(self, action):
+        self._start = time.perf_counter()
+
+    def after_step(self, observation, reward, terminated, truncated, info):
+        self.step_time += time.perf_counter() - self._start
+        self.steps += 1
+
+    def on_episode_end(self, total_reward, step_count):
+        self.episode_time += time.perf_counter() - self._episode_start
+        self.episodes += 1
+
+    def summary(self):
+        """
+        :return: Dict with total seconds per phase, mean microseconds per step and step/episode counts.
+        """
+        other_time = self.episode_time - self.act_time - self.step_time
+        steps = max(self.steps, 1)
+        return {
+            'act_s': self.act_time,
+            'step_s': self.step_time,
+            'other_s': other_time,
+            'total_s': self.episode_time,
+            'act_us_per_step': self.act_time / steps * 1e6,
+            'step_us_per_step': self.step_time / steps * 1e6,
+            'other_us_per_step': other_time / steps * 1e6,
+            'steps': self.steps,
+            'episodes': self.episodes,
+        }
@@ -0,0 +1,81 @@
+import numpy as np
+from environments.custom.tabular_mdp import transition_table
+
+def policy_matrix(agent, size, n_actions=4):
+    """
+    Action probabilities of an agent in every cell of a size x size grid.
+
+    :param agent: An agent with action_probabilities, see BaseAgent.
+    :return: Float array of shape (size * size, n_actions), row s = row * size + col.
+    """
+    rows, cols = np.divmod(np.arange(size * size), size)
+    observations = np.stack([rows, cols], axis=1).astype(np.int32)
+    return np.asarray(agent.action_probabilities(observations, n_actions), dtype=np.float64)
+
+
+def evaluate_exact(policy, env, max_steps=100, min_steps=1, tol=1e-12):
+    """
+    Exact expected per-step reward and distance of a policy, without sampling any episodes.
+
+    The state distribution is propagated through the policy-induced Markov chain with one sparse
+    mat-vec product per step (a weighted bincount over the (state, executed action) pairs). The
+    episode rules are those of run_agent: an episode stops after a terminating step once at least
+    min_steps steps are taken, or after max(max_steps, min_steps) steps.
+
+    :param policy: An agent with action_probabilities, or a (size * size, 4) array of action probabilities.
+    :param env: A GridWorldEnv or SlipGridWorldEnv.
+    :param max_steps: Maximum number of steps per episode.
+    :param min_steps: Minimum number of steps per episode.
+    :param tol: Propagation stops early once less probability mass than this is still running.
+    :return: (reward_histories, distance_histories, hitting_probs). The histories have shape (1, T) and
+        hold the expected reward and distance per step with finished episodes counting as 0, i.e. the
+        limit of the padded mean over infinitely many episodes, so they can be passed straight to
+        plot_reward_histories and plot_distances. hitting_probs[t] is the probability that the goal is
+        first reached on step t + 1.
+    """
+    size = env.size
+    n_states = size * size
+    if not isinstance(policy, np.ndarray):
+        policy = policy_matrix(policy, size)
+    next_state, reward, terminated = transition_table(size, env.target_pos, env.obstacles)
+
+    # Distribution over the action actually executed, slips included
+    slip_prob = getattr(env, 'slip_prob', 0.0)
+    executed = (1.0 - slip_prob) * policy + slip_prob / policy.shape[1]
+
+    rows, cols = np.divmod(next_state, size)
+    next_distance = np.hypot(rows - env.target_pos[0], cols - env.target_pos[1])
+    next_state, terminated = next_state.ravel(), terminated.ravel()
+    step_reward = (executed * reward).ravel()
+    step_distance = (executed * next_distance).ravel()
+    executed = executed.ravel()
+
+    start = (0, 0) if env.start_pos is None else env.start_pos
+    alive = np.zeros(n_states)
+    alive[start[0] * size + start[1]] = 1.0
+    # Episodes that have not reached the goal yet, for the first hitting time
+    unhit = alive.copy()
+
+    n_steps = max(max_steps, min_steps)
+    rewards = np.zeros(n_steps)
+    distances = np.zeros(n_steps)
+    hitting_probs = np.zeros(n_steps)
+    for t in range(n_steps):
+        state_mass = np.repeat(alive, policy.shape[1])
+        rewards[t] = state_mass @ step_reward
+        distances[t] = state_mass @ step_distance
+
+        flow = state_mass * executed
+        if t + 1 >= min_steps:
+            flow = np.where(terminated, 0.0, flow)
+        alive = np.bincount(next_state, weights=flow, minlength=n_states)
+
+        unhit_flow = np.repeat(unhit, policy.shape[1]) * executed
+        hitting_probs[t] = unhit_flow[terminated].sum()
+        unhit = np.bincount(next_state, weights=np.where(terminated, 0.0, unhit_flow), minlength=n_states)
+
+        if t + 1 >= min_steps and alive.sum() < tol and unhit.sum() < tol:
+            rewards, distances, hitting_probs = rewards[:t + 1], distances[:t + 1], hitting_probs[:t + 1]
+            break
+
+    return rewards[None, :], distances[None, :], hitting_probs
@@ -0,0 +1,143 @@
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+import numpy as np
+from .step_statistics import StepStatistics
+
+PLOT_MODES = ('auto', 'lines', 'density', 'quantiles')
+# Above this many episodes 'auto' mode switches from per-episode lines to a density heatmap
+MAX_AUTO_LINES = 200
+
+
+def _downsample(n_steps, max_points):
+    # Step indices to plot, at most max_points of them
+    if max_points is None or n_steps <= max_points:
+        return np.arange(n_steps)
+    return np.linspace(0, n_steps - 1, max_points).round().astype(np.int64)
+
+
+def _plot_lines(ax, histories, steps):
+    segments = np.empty((histories.shape[0], len(steps), 2))
+    segments[:, :, 0] = steps
+    segments[:, :, 1] = histories[:, steps]
+    colors = plt.get_cmap('tab10')(np.arange(histories.shape[0]) % 10)
+    ax.add_collection(LineCollection(segments, colors=colors, linewidths=1, label='Episodes'))
+    ax.autoscale()
+
+
+def _plot_density(ax, histories, steps, value_bins=100):
+    values = histories[:, steps]
+    low, high = values.min(), values.max()
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    # One histogram per plotted step, computed in one pass via bin indices
+    bin_idx = np.clip(((values - low) / (high - low) * value_bins).astype(np.int64), 0, value_bins - 1)
+    flat_idx = bin_idx * len(steps) + np.arange(len(steps))
+    counts = np.bincount(flat_idx.ravel(), minlength=value_bins * len(steps)).reshape(value_bins, len(steps))
+    # Value rows at the bin centres, matching the per-interval counts
+    centres = low + (np.arange(value_bins) + 0.5) * (high - low) / value_bins
+    mesh = ax.pcolormesh(steps, centres, counts, shading='nearest', cmap='viridis')
+    ax.figure.colorbar(mesh, ax=ax, label='Episodes')
+
+
+def _plot_quantiles(ax, histories, steps):
+    q05, q25, q50, q75, q95 = np.quantile(histories[:, steps], [0.05, 0.25, 0.5, 0.75, 0.95], axis=0)
+    ax.fill_between(steps, q05, q95, alpha=0.2, label='5-95%')
+    ax.fill_between(steps, q25, q75, alpha=0.4, label='25-75%')
+    ax.plot(steps, q50, label='Median')
+
+
+def _finish(fig, save_path, show):
+    plt.tight_layout()
+    if save_path is not None:
+        fig.savefig(save_path)
+    if show is None:
+        show = save_path is None
+    if show:
+        plt.show()
+
+
+def plot_histories(histories, quantity, name='histories', mode='auto', max_points=2000, save_path=None, show=None):
+    """
+    Plots per-episode histories of one quantity, its average per step and its cumulative average.
+
+    :param histories: A 2D numpy array with one row per episode, or StepStatistics.
+    :param quantity: Name of the plotted quantity, e.g. 'Reward', used in titles and labels.
+    :param name: Argument name used in error messages.
+    :param mode: How to draw the top panel: 'lines' (one LineCollection), 'density' (step-by-value heatmap),
+        'quantiles' (quantile bands) or 'auto' (lines up to MAX_AUTO_LINES episodes, density above).
+        StepStatistics always draw mean +- std and only accept 'auto'.
+    :param max_points: Maximum number of steps drawn per curve, longer horizons are downsampled.
+    :param save_path: If given, the figure is saved to this file.
+    :param show: Whether to call plt.show(), defaults to True only when save_path is None.
+    :return: (fig, axs)
+    """
+    # Checked before any figure is created, so a bad call leaves no open figure behind
+    if mode not in PLOT_MODES:
+        raise ValueError(f"Unknown plot mode {mode}")
+    if isinstance(histories, StepStatistics):
+        if mode != 'auto':
+            raise ValueError(f"Plot mode {mode} needs per-episode histories, StepStatistics only support 'auto'.")
+        return _plot_statistics(histories, quantity, name, max_points, save_path, show)
+    if not isinstance(histories, np.ndarray):
+        raise ValueError(f"{name} must be a numpy array.")
+    if histories.ndim != 2:
+        raise ValueError(f"{name} must be a 2D array with shape (num_episodes, num_steps).")
+    if histories.shape[0] == 0 or histories.shape[1] == 0:
+        raise ValueError(f"{name} cannot be empty.")
+    if mode == 'auto':
+        mode = 'lines' if histories.shape[0] <= MAX_AUTO_LINES else 'density'
+
+    steps = _downsample(histories.shape[1], max_points)
+    mean = np.mean(histories, axis=0)
+
+    fig, axs = plt.subplots(3, 1, figsize=(12, 18))
+    axs[0].set_title(f'{quantity} History Across Episodes')
+    if mode == 'lines':
+        _plot_lines(axs[0], histories, steps)
+    elif mode == 'density':
+        _plot_density(axs[0], histories, steps)
+    else:
+        _plot_quantiles(axs[0], histories, steps)
+    axs[0].set_xlabel('Step')
+    axs[0].set_ylabel(quantity)
+    if mode != 'density':
+        axs[0].legend()
+    axs[0].grid()
+    _plot_averages(axs, mean, steps, quantity)
+    _finish(fig, save_path, show)
+    return fig, axs
+
+
+def _plot_averages(axs, mean, steps, quantity):
+    axs[1].set_title(f'Average {quantity} per Step Across Episodes')
+    axs[1].plot(steps, mean[steps], label=f'Average {quantity} per Step', color='orange')
+    axs[1].set_xlabel('Step')
+    axs[1].set_ylabel(f'Average {quantity}')
+    axs[1].legend()
+    axs[1].grid()
+    axs[2].set_title(f'Cumulative {quantity} Across Steps')
+    axs[2].plot(steps, np.cumsum(mean)[steps], label=f'Cumulative {quantity}', color='green')
+    axs[2].set_xlabel('Step')
+    axs[2].set_ylabel(f'Cumulative {quantity}')
+    axs[2].legend()
+    axs[2].grid()
+
+
+def _plot_statistics(stats, quantity, name, max_points, save_path, show):
+    # Streaming statistics have no per-episode rows, so the top panel shows mean +- std instead
+    if stats.n_episodes == 0:
+        raise ValueError(f"{name} cannot be empty.")
+    n = stats.num_steps
+    steps = _downsample(n, max_points)
+    mean, std = stats.mean[steps], stats.std[steps]
+    fig, axs = plt.subplots(3, 1, figsize=(12, 18))
+    axs[0].set_title(f'{quantity} Mean and Std Across Episodes')
+    axs[0].plot(steps, mean, label=f'Mean {quantity} (running episodes)')
+    axs[0].fill_between(steps, mean - std, mean + std, alpha=0.3, label='+- 1 std')
+    axs[0].set_xlabel('Step')
+    axs[0].set_ylabel(quantity)
+    axs[0].legend()
+    axs[0].grid()
+    _plot_averages(axs, stats.padded_mean(), steps, quantity)
+    _finish(fig, save_path, show)
+    return fig, axs
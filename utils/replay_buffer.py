@@ -0,0 +1,251 @@
+import numpy as np
+from gymnasium import spaces
+from .callbacks import Callback
+
+class SumTree:
+    def __init__(self, capacity):
+        """
+        Binary sum tree over non-negative priorities stored in one flat array, for sampling index i
+        with probability priorities[i] / total.
+
+        Node 1 is the root, node j has children 2j and 2j + 1, and leaf i sits at node leaf_offset + i.
+
+        :param capacity: Number of leaves.
+        """
+        self.capacity = capacity
+        self.leaf_offset = 1 << max(capacity - 1, 1).bit_length()
+        self.tree = np.zeros(2 * self.leaf_offset)
+        self.depth = self.leaf_offset.bit_length() - 1
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    @property
+    def priorities(self):
+        return self.tree[self.leaf_offset:self.leaf_offset + self.capacity]
+
+    def update(self, indices, priorities):
+        """
+        Sets the priorities of the given leaves and recomputes their ancestors, one tree level per numpy call.
+        """
+        nodes = np.asarray(indices, dtype=np.int64) + self.leaf_offset
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """
+        Finds for each value in [0, total) the leaf whose cumulative priority range contains it.
+
+        :param values: Float array of shape (N,).
+        :return: Int array of shape (N,) with leaf indices.
+        """
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = self.tree[2 * nodes]
+            go_right = values >= left
+            values -= np.where(go_right, left, 0.0)
+            nodes = 2 * nodes + go_right
+        # Rounding can step onto an empty leaf past the last filled one
+        return np.minimum(nodes - self.leaf_offset, self.capacity - 1)
+
+
+class ReplayBuffer(Callback):
+    def __init__(self, capacity, observation_space, action_space, n_step=1, gamma=0.99, prioritized=False,
+                 alpha=0.6, seed=None):
+        """
+        Fixed-capacity ring buffer of transitions in preallocated numpy arrays, for off-policy agents.
+
+        As a Callback it can be passed to run_agent directly, e.g. run_agent(agent, env, callbacks=buffer),
+        and writes every step straight into its arrays. Episode boundaries are kept alongside the
+        transitions, so n-step returns never reach into the next episode.
+
+        :param capacity: Maximum number of transitions, the oldest are overwritten first.
+        :param observation_space: Space of a single observation, fixes the observation shape and dtype.
+        :param action_space: Space of a single action, fixes the action shape and dtype.
+        :param n_step: Number of steps summed into the sampled returns.
+        :param gamma: Discount factor of the n-step returns.
+        :param prioritized: Sample proportionally to priority ** alpha instead of uniformly.
+        :param alpha: Priority exponent, 0 is uniform.
+        :param seed: Seed for the sampling generator.
+        """
+        self.capacity = capacity
+        self.n_step = n_step
+        self.gamma = gamma
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.rng = np.random.default_rng(seed)
+
+        obs_shape, obs_dtype = observation_space.shape, observation_space.dtype
+        if isinstance(action_space, spaces.Discrete):
+            action_shape, action_dtype = (), np.int64
+        else:
+            action_shape, action_dtype = action_space.shape, action_space.dtype
+        self.observations = np.zeros((capacity,) + tuple(obs_shape), dtype=obs_dtype)
+        self.actions = np.zeros((capacity,) + tuple(action_shape), dtype=action_dtype)
+        self.rewards = np.zeros(capacity)
+        self.next_observations = np.zeros_like(self.observations)
+        self.dones = np.zeros(capacity, dtype=bool)
+        # True where an episode ended for any reason (termination, truncation or run_agent stopping)
+        self.episode_ends = np.zeros(capacity, dtype=bool)
+        self._pos = 0
+        self._size = 0
+
+        if prioritized:
+            self.tree = SumTree(capacity)
+            self.max_priority = 1.0
+            # New transitions get max_priority; their leaves are only pushed into the tree before sampling
+            self._stale = []
+
+    @classmethod
+    def from_env(cls, env, capacity, **kwargs):
+        """
+        Builds a buffer sized from the env's observation_space and action_space. For vector envs the
+        per-env single_observation_space and single_action_space are used.
+        """
+        return cls(capacity, getattr(env, 'single_observation_space', env.observation_space),
+                   getattr(env, 'single_action_space', env.action_space), **kwargs)
+
+    def __len__(self):
+        return self._size
+
+    def seed(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, observation, action, reward, next_observation, terminated, truncated=False):
+        """
+        Inserts one transition in O(1), overwriting the oldest one when full.
+        """
+        i = self._pos
+        self.observations[i] = observation
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_observations[i] = next_observation
+        self.dones[i] = terminated
+        self.episode_ends[i] = terminated or truncated
+        self._advance()
+
+    def add_batch(self, observations, actions, rewards, next_observations, terminated, truncated=None):
+        """
+        Inserts a batch of transitions, e.g. one VectorGridWorldEnv step, with one write per array.
+        Pass info['final_observation'] as next_observations so finished envs keep their last observation.
+        """
+        n = len(rewards)
+        for name, values, buffer in (('observations', observations, self.observations),
+                                     ('actions', actions, self.actions),
+                                     ('next_observations', next_observations, self.next_observations)):
+            if np.shape(values) != (n,) + buffer.shape[1:]:
+                raise ValueError(f"Expected {name} of shape {(n,) + buffer.shape[1:]}, got {np.shape(values)}")
+        indices = (self._pos + np.arange(n)) % self.capacity
+        self.observations[indices] = observations
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_observations[indices] = next_observations
+        self.dones[indices] = terminated
+        self.episode_ends[indices] = terminated if truncated is None else np.logical_or(terminated, truncated)
+        if self.prioritized:
+            self._stale.extend(indices[-self.capacity:].tolist())
+            if len(self._stale) >= self.capacity:
+                self._flush_priorities()
+        self._pos = (self._pos + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def _advance(self):
+        if self.prioritized:
+            self._stale.append(self._pos)
+            if len(self._stale) >= self.capacity:
+                self._flush_priorities()
+        self._pos = (self._pos + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    # Callback hooks: run_agent fills one row per step in place
+
+    def after_act(self, observation, action):
+        # Copied before env.step, so envs that reuse their observation array (fast mode) are fine
+        self.observations[self._pos] = observation
+        self.actions[self._pos] = action
+
+    def after_step(self, observation, reward, terminated, truncated, info):
+        i = self._pos
+        self.rewards[i] = reward
+        self.next_observations[i] = observation
+        self.dones[i] = terminated
+        self.episode_ends[i] = terminated or truncated
+        self._advance()
+
+    def on_episode_end(self, total_reward, step_count):
+        # run_agent can stop on its step limit without the env truncating
+        if self._size:
+            self.episode_ends[(self._pos - 1) % self.capacity] = True
+
+    def _n_step_targets(self, indices):
+        # Rewards are summed until an episode end or the newest transition, whichever comes first
+        offsets = np.arange(self.n_step)
+        window = (indices[:, None] + offsets) % self.capacity
+        newer = (self._pos - 1 - indices) % self.capacity
+        alive = offsets[None, :] <= newer[:, None]
+        ended = np.cumsum(self.episode_ends[window], axis=1)
+        alive[:, 1:] &= ended[:, :-1] == 0
+        n_used = alive.sum(axis=1)
+        returns = np.sum(np.where(alive, self.rewards[window] * self.gamma ** offsets, 0.0), axis=1)
+        last = window[np.arange(len(indices)), n_used - 1]
+        return returns, last, self.gamma ** n_used
+
+    def sample(self, batch_size, beta=0.4):
+        """
+        Samples a batch of transitions with vectorized indexing.
+
+        :param batch_size: Number of transitions.
+        :param beta: Importance-sampling exponent for prioritized sampling.
+        :return: Dict of arrays: observations, actions, rewards, next_observations, dones, discounts,
+            indices and weights. With n_step > 1 the rewards are discounted n-step returns,
+            next_observations and dones belong to the last step used, and discounts holds
+            gamma ** steps_used for bootstrapping. weights are all 1 for uniform sampling.
+        """
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty buffer")
+        if self.prioritized:
+            self._flush_priorities()
+            # Stratified: one uniform draw per equal slice of the total priority
+            bounds = self.tree.total * (np.arange(batch_size) + self.rng.random(batch_size)) / batch_size
+            indices = self.tree.find(bounds)
+            probs = self.tree.priorities[indices] / self.tree.total
+            weights = (self._size * probs) ** -beta
+            weights /= weights.max()
+        else:
+            indices = self.rng.integers(0, self._size, size=batch_size)
+            weights = np.ones(batch_size)
+
+        if self.n_step > 1:
+            rewards, last, discounts = self._n_step_targets(indices)
+        else:
+            rewards, last, discounts = self.rewards[indices], indices, np.full(batch_size, self.gamma)
+        return {
+            'observations': self.observations[indices],
+            'actions': self.actions[indices],
+            'rewards': rewards,
+            'next_observations': self.next_observations[last],
+            'dones': self.dones[last],
+            'discounts': discounts,
+            'indices': indices,
+            'weights': weights,
+        }
+
+    def update_priorities(self, indices, priorities, eps=1e-6):
+        """
+        Sets new priorities, typically the absolute TD errors of a sampled batch.
+        """
+        if not self.prioritized:
+            raise ValueError("update_priorities needs a prioritized buffer")
+        self._flush_priorities()
+        priorities = np.abs(priorities) + eps
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+    def _flush_priorities(self):
+        if self._stale:
+            self.tree.update(np.array(self._stale), self.max_priority ** self.alpha)
+            self._stale = []
@@ -1,4 +1,12 @@
-def run_agent(agent, env, max_steps=100, min_steps=1, render=False):
+import os
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .step_statistics import EpisodeStatistics
+from .callbacks import CallbackList
+
+def run_agent(agent, env, max_steps=100, min_steps=1, render=False, seed=None, stats=None, keep_history=True,
+              recorder=None, callbacks=None):
     """
     Runs a single episode with the given environment and agent.
 
@@ -6,36 +14,48 @@ def run_agent(agent, env, max_steps=100, min_steps=1, render=False):
     :param agent: The agent that will interact with the environment.
     :param max_steps: Maximum number of steps in the episode.
     :param render: Whether to render the environment.
+    :param seed: Optional seed passed to env.reset.
+    :param stats: Optional EpisodeStatistics that is fed every step's reward and distance.
+    :param keep_history: Whether to collect the per-step reward and distance lists.
+    :param recorder: Optional TrajectoryWriter that every step is appended to.
+    :param callbacks: Optional Callback or list of Callbacks, see utils.callbacks.
     :return: Total reward accumulated during the episode.
     """
-    observation, info = env.reset()
+    hooks = CallbackList(callbacks) if callbacks is not None else None
+    observation, info = env.reset(seed=seed)
+    if hooks is not None:
+        hooks.on_reset(observation, info)
     total_reward = 0
     done = False
     step_count = 0
     reward_history = []
     distances = []
-    
-    for i in range(min_steps):
-        if render:
-            env.render()
 
-        action = agent.act(observation)
-        observation, reward, done, truncated, info = env.step(action)
-        reward_history.append(reward)
-        distances.append(info.get('distance_to_goal', 0))
-        total_reward += reward
-        step_count += 1
     # Ensure we run at least min_steps before checking for done
-    if done:
-        return total_reward, reward_history, distances  # Return early if the episode is done
-    while not done and step_count < max_steps:
+    while step_count < min_steps or (not done and step_count < max_steps):
         if render:
             env.render()
 
+        if hooks is not None:
+            hooks.before_act(observation)
         action = agent.act(observation)
+        if hooks is not None:
+            hooks.after_act(observation, action)
+        if recorder is not None:
+            recorder.observe(observation)
+        if hooks is not None:
+            hooks.before_step(action)
         observation, reward, done, truncated, info = env.step(action)
-        reward_history.append(reward)
-        distances.append(info.get('distance_to_goal', 0))
+        if hooks is not None:
+            hooks.after_step(observation, reward, done, truncated, info)
+        distance = info.get('distance_to_goal', 0)
+        if keep_history:
+            reward_history.append(reward)
+            distances.append(distance)
+        if stats is not None:
+            stats.update(step_count, reward, distance)
+        if recorder is not None:
+            recorder.record(action, reward, distance, done)
 
         total_reward += reward
         step_count += 1
@@ -43,4 +63,166 @@ def run_agent(agent, env, max_steps=100, min_steps=1, render=False):
     if render:
         env.render()  # Final render after the episode ends
 
+    if stats is not None:
+        stats.end_episode(step_count, total_reward)
+    if recorder is not None:
+        recorder.end_episode()
+    if hooks is not None:
+        hooks.on_episode_end(total_reward, step_count)
     return total_reward, reward_history, distances
+
+
+# Per-process env and agent, built once by _init_worker and reused for every episode
+_worker_env = None
+_worker_agent = None
+
+
+def _init_worker(agent_factory, env_factory):
+    global _worker_env, _worker_agent
+    _worker_env = env_factory()
+    _worker_agent = agent_factory(_worker_env)
+
+
+def _seed_episode(agent, env, seed):
+    # Reseed every random source an episode can touch, so results only depend on the seed
+    np.random.seed(seed)
+    env.action_space.seed(seed)
+    if hasattr(agent, 'seed'):
+        agent.seed(seed)
+    elif hasattr(agent, 'action_space'):
+        agent.action_space.seed(seed)
+
+
+def _run_chunk(episode_seeds, max_steps, min_steps, streaming=False):
+    if streaming:
+        stats = EpisodeStatistics(max(max_steps, min_steps))
+        for seed in episode_seeds:
+            _seed_episode(_worker_agent, _worker_env, seed)
+            run_agent(_worker_agent, _worker_env, max_steps=max_steps, min_steps=min_steps, seed=seed,
+                      stats=stats, keep_history=False)
+        return stats
+
+    total_rewards = np.zeros(len(episode_seeds))
+    reward_histories = np.zeros((len(episode_seeds), max(max_steps, min_steps)))
+    distance_histories = np.zeros_like(reward_histories)
+    lengths = np.zeros(len(episode_seeds), dtype=np.int64)
+    for i, seed in enumerate(episode_seeds):
+        _seed_episode(_worker_agent, _worker_env, seed)
+        total_reward, reward_history, distances = run_agent(
+            _worker_agent, _worker_env, max_steps=max_steps, min_steps=min_steps, seed=seed)
+        total_rewards[i] = total_reward
+        lengths[i] = len(reward_history)
+        reward_histories[i, :lengths[i]] = reward_history
+        distance_histories[i, :lengths[i]] = distances
+    return total_rewards, reward_histories, distance_histories, lengths
+
+
+def run_episodes(agent_factory, env_factory, n_episodes, workers=None, seed=0, max_steps=100, min_steps=1,
+                 chunk_size=None, streaming=False, first_episode=0):
+    """
+    Runs n_episodes episodes spread over a process pool and stacks the results.
+
+    Episode i is seeded from np.random.SeedSequence(seed).spawn(n_episodes)[i], so the results are
+    bit-identical for any number of workers. Each worker builds one env and agent and reuses them,
+    so agents must not carry state from one episode to the next.
+
+    :param agent_factory: Picklable callable taking the env and returning an agent.
+    :param env_factory: Picklable callable returning a fresh environment.
+    :param n_episodes: Number of episodes to run.
+    :param workers: Number of worker processes, defaults to os.cpu_count(). 1 runs in-process.
+    :param seed: Base seed from which all episode seeds are derived.
+    :param max_steps: Maximum number of steps per episode.
+    :param min_steps: Minimum number of steps per episode, see run_agent.
+    :param chunk_size: Episodes per task sent to a worker.
+    :param streaming: Return merged EpisodeStatistics instead of full histories, in constant memory.
+        The merge order follows the chunks, so pass a fixed chunk_size for bit-identical statistics
+        across worker counts.
+    :param first_episode: Index of the first episode, so consecutive calls can continue one seed stream.
+    :return: (total_rewards, reward_histories, distance_histories, lengths) where the histories
+        have shape (n_episodes, max_len) and are zero-padded past each episode's length,
+        or an EpisodeStatistics if streaming is set.
+    """
+    if n_episodes < 1:
+        raise ValueError(f"n_episodes must be at least 1, got {n_episodes}")
+    workers = workers or os.cpu_count() or 1
+    # Same as SeedSequence(seed).spawn(first_episode + n_episodes)[first_episode:]
+    episode_seeds = [int(np.random.SeedSequence(seed, spawn_key=(i,)).generate_state(1)[0])
+                     for i in range(first_episode, first_episode + n_episodes)]
+    chunk_size = chunk_size or max(1, -(-n_episodes // (workers * 4)))
+    chunks = [episode_seeds[i:i + chunk_size] for i in range(0, n_episodes, chunk_size)]
+
+    if workers == 1:
+        # _seed_episode reseeds the global numpy RNG, which is the caller's own in-process
+        global_state = np.random.get_state()
+        try:
+            _init_worker(agent_factory, env_factory)
+            results = [_run_chunk(chunk, max_steps, min_steps, streaming) for chunk in chunks]
+        finally:
+            np.random.set_state(global_state)
+    else:
+        n_chunks = len(chunks)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(agent_factory, env_factory)) as pool:
+            results = list(pool.map(_run_chunk, chunks, [max_steps] * n_chunks, [min_steps] * n_chunks,
+                                    [streaming] * n_chunks))
+
+    if streaming:
+        stats = results[0]
+        for other in results[1:]:
+            stats.merge(other)
+        return stats
+
+    total_rewards, reward_histories, distance_histories, lengths = (np.concatenate(r) for r in zip(*results))
+    max_len = lengths.max()
+    return total_rewards, reward_histories[:, :max_len], distance_histories[:, :max_len], lengths
+
+
+def run_until_confident(agent_factory, env_factory, target_width, confidence=0.95, batch_size=10,
+                        max_episodes=1000, workers=None, seed=0, max_steps=100, min_steps=1):
+    """
+    Runs episodes in batches until the confidence interval of the mean return is at most target_width
+    wide, or max_episodes episodes have been run.
+
+    After each batch the number of episodes the current variance estimate needs is extrapolated, so
+    low-variance configurations stop after the first batch while noisy ones grow in few large batches.
+    Episode i uses the same seed as in run_episodes, so the statistics equal those of a fixed-budget
+    run with the number of episodes that was used.
+
+    :param agent_factory: Picklable callable taking the env and returning an agent.
+    :param env_factory: Picklable callable returning a fresh environment.
+    :param target_width: Full width (upper minus lower bound) the interval has to reach.
+    :param confidence: Confidence level of the normal-approximation interval.
+    :param batch_size: Episodes in the first batch and minimum episodes per further batch, at least 2.
+    :param max_episodes: Episode budget.
+    :param workers: Number of worker processes, see run_episodes.
+    :param seed: Base seed from which all episode seeds are derived.
+    :param max_steps: Maximum number of steps per episode.
+    :param min_steps: Minimum number of steps per episode, see run_agent.
+    :return: (stats, interval) with the merged EpisodeStatistics, whose n_episodes is the number of
+        episodes used, and the final (low, high) interval of the mean return.
+    """
+    if not target_width > 0:
+        raise ValueError(f"target_width must be positive, got {target_width}")
+    if max_episodes < 1:
+        raise ValueError(f"max_episodes must be at least 1, got {max_episodes}")
+    batch_size = max(2, batch_size)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    stats = None
+    n_episodes = 0
+    while n_episodes < max_episodes:
+        if stats is None:
+            n_batch = batch_size
+        else:
+            # Episodes needed for width 2 * z * std / sqrt(n) <= target_width
+            needed = int(np.ceil((2 * z) ** 2 * stats.return_variance / target_width ** 2))
+            n_batch = max(batch_size, needed - n_episodes)
+        n_batch = min(n_batch, max_episodes - n_episodes)
+        # A fixed chunk size keeps the merged statistics independent of the number of workers
+        batch = run_episodes(agent_factory, env_factory, n_batch, workers=workers, seed=seed, max_steps=max_steps,
+                             min_steps=min_steps, chunk_size=batch_size, streaming=True, first_episode=n_episodes)
+        stats = batch if stats is None else stats.merge(batch)
+        n_episodes += n_batch
+        low, high = stats.return_confidence_interval(confidence)
+        if high - low <= target_width:
+            break
+    return stats, (low, high)
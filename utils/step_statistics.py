@@ -0,0 +1,169 @@
+from statistics import NormalDist
+import numpy as np
+
+class StepStatistics:
+    def __init__(self, max_steps):
+        """
+        Online per-step count, mean and variance of one quantity over many episodes, in fixed memory.
+
+        Values of the running episode are buffered and folded into the statistics in one vectorized
+        Welford update when the episode ends.
+
+        :param max_steps: Maximum episode length that can be recorded.
+        """
+        self.max_steps = max_steps
+        self.n_episodes = 0
+        self.count = np.zeros(max_steps, dtype=np.int64)
+        self.mean = np.zeros(max_steps)
+        self.m2 = np.zeros(max_steps)
+        self._episode = np.zeros(max_steps)
+
+    def update(self, step, value):
+        """
+        Records the value observed at the given step of the running episode.
+        """
+        self._episode[step] = value
+
+    def end_episode(self, length):
+        """
+        Folds the first `length` buffered values into the statistics.
+        """
+        self.add_episode(self._episode[:length])
+
+    def add_episode(self, values):
+        """
+        Adds a whole episode at once.
+
+        :param values: 1D array with one value per step.
+        """
+        n = len(values)
+        self.n_episodes += 1
+        self.count[:n] += 1
+        delta = values - self.mean[:n]
+        self.mean[:n] += delta / self.count[:n]
+        self.m2[:n] += delta * (values - self.mean[:n])
+
+    def merge(self, other):
+        """
+        Merges the statistics of another StepStatistics (e.g. from a worker process) into this one.
+        """
+        n = min(self.max_steps, other.max_steps)
+        if np.any(other.count[n:]):
+            raise ValueError("Cannot merge statistics of longer episodes than max_steps.")
+        count = self.count[:n] + other.count[:n]
+        safe_count = np.maximum(count, 1)
+        delta = other.mean[:n] - self.mean[:n]
+        self.mean[:n] += delta * other.count[:n] / safe_count
+        self.m2[:n] += other.m2[:n] + delta ** 2 * self.count[:n] * other.count[:n] / safe_count
+        self.count[:n] = count
+        self.n_episodes += other.n_episodes
+        return self
+
+    @property
+    def num_steps(self):
+        """
+        Length of the longest recorded episode.
+        """
+        nonzero = np.flatnonzero(self.count)
+        return nonzero[-1] + 1 if nonzero.size else 0
+
+    @property
+    def variance(self):
+        """
+        Per-step sample variance over the episodes that reached each step.
+        """
+        return self.m2 / np.maximum(self.count - 1, 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def padded_mean(self):
+        """
+        Per-step mean with finished episodes counting as 0, the same as averaging zero-padded histories.
+        """
+        n = self.num_steps
+        return self.mean[:n] * self.count[:n] / max(self.n_episodes, 1)
+
+
+class EpisodeStatistics:
+    def __init__(self, max_steps):
+        """
+        Streaming reward, distance and return statistics that run_agent can feed step by step.
+
+        :param max_steps: Maximum episode length that can be recorded.
+        """
+        self.rewards = StepStatistics(max_steps)
+        self.distances = StepStatistics(max_steps)
+        self.n_episodes = 0
+        self.return_mean = 0.0
+        self.return_m2 = 0.0
+
+    def update(self, step, reward, distance):
+        self.rewards.update(step, reward)
+        self.distances.update(step, distance)
+
+    def end_episode(self, length, total_reward):
+        self.rewards.end_episode(length)
+        self.distances.end_episode(length)
+        self.n_episodes += 1
+        delta = total_reward - self.return_mean
+        self.return_mean += delta / self.n_episodes
+        self.return_m2 += delta * (total_reward - self.return_mean)
+
+    def merge(self, other):
+        """
+        Merges the statistics of another EpisodeStatistics into this one.
+        """
+        self.rewards.merge(other.rewards)
+        self.distances.merge(other.distances)
+        count = self.n_episodes + other.n_episodes
+        if count:
+            delta = other.return_mean - self.return_mean
+            self.return_mean += delta * other.n_episodes / count
+            self.return_m2 += other.return_m2 + delta ** 2 * self.n_episodes * other.n_episodes / count
+        self.n_episodes = count
+        return self
+
+    @property
+    def return_variance(self):
+        return self.return_m2 / max(self.n_episodes - 1, 1)
+
+    def return_confidence_interval(self, confidence=0.95):
+        """
+        Normal-approximation confidence interval of the mean return.
+
+        :return: (low, high), infinitely wide with fewer than two episodes.
+        """
+        if self.n_episodes < 2:
+            return -np.inf, np.inf
+        half_width = NormalDist().inv_cdf(0.5 + confidence / 2) * np.sqrt(self.return_variance / self.n_episodes)
+        return float(self.return_mean - half_width), float(self.return_mean + half_width)
+
+    def to_arrays(self):
+        """
+        :return: Dict of numpy arrays holding the full state, e.g. for np.savez.
+        """
+        arrays = {'n_episodes': np.array(self.n_episodes), 'return_mean': np.array(self.return_mean),
+                  'return_m2': np.array(self.return_m2)}
+        for name, stats in (('rewards', self.rewards), ('distances', self.distances)):
+            arrays[f'{name}_count'] = stats.count
+            arrays[f'{name}_mean'] = stats.mean
+            arrays[f'{name}_m2'] = stats.m2
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuilds statistics saved with to_arrays.
+        """
+        stats = cls(len(arrays['rewards_count']))
+        stats.n_episodes = int(arrays['n_episodes'])
+        stats.return_mean = float(arrays['return_mean'])
+        stats.return_m2 = float(arrays['return_m2'])
+        for name, step_stats in (('rewards', stats.rewards), ('distances', stats.distances)):
+            step_stats.count[:] = arrays[f'{name}_count']
+            step_stats.mean[:] = arrays[f'{name}_mean']
+            step_stats.m2[:] = arrays[f'{name}_m2']
+            step_stats.n_episodes = stats.n_episodes
+        return stats
@@ -0,0 +1,160 @@
+import os
+import numpy as np
+
+# Size of the reserved .npy header, large enough for any shape so it can be rewritten in place on close
+_HEADER_SIZE = 128
+_COLUMNS = ('observations', 'actions', 'rewards', 'distances', 'dones')
+
+
+def _write_npy_header(f, shape, dtype):
+    header = repr({'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False, 'shape': tuple(shape)})
+    # magic (6) + version (2) + header length (2) + header padded with spaces and terminated by a newline
+    header = header.ljust(_HEADER_SIZE - 10 - 1) + '\n'
+    f.seek(0)
+    f.write(np.lib.format.magic(1, 0))
+    f.write(np.uint16(len(header)).tobytes())
+    f.write(header.encode('latin1'))
+
+
+class TrajectoryStore:
+    def __init__(self, columns, offsets):
+        """
+        Recorded episodes stored column-wise as flat arrays, with episode i spanning offsets[i]:offsets[i + 1].
+
+        :param columns: Dict mapping column name to a flat array (possibly memory-mapped).
+        :param offsets: Int array of shape (n_episodes + 1,).
+        """
+        self.columns = columns
+        self.offsets = offsets
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """
+        Loads a store written by TrajectoryWriter, memory-mapped so nothing is read until sliced.
+        """
+        columns = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode) for name in _COLUMNS}
+        return cls(columns, np.load(os.path.join(path, 'offsets.npy')))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def episode(self, i):
+        """
+        Returns a dict of zero-copy views on the columns of episode i.
+        """
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return {name: column[start:end] for name, column in self.columns.items()}
+
+    def __getitem__(self, i):
+        return self.episode(i)
+
+    def padded(self, name, fill_value=0, max_len=None):
+        """
+        Stacks one column into an (n_episodes, max_len) array, padding short episodes with fill_value.
+        Useful for plot_reward_histories and plot_distances.
+        """
+        lengths = self.lengths
+        max_len = max_len or int(lengths.max())
+        column = self.columns[name]
+        out = np.full((len(self), max_len) + column.shape[1:], fill_value, dtype=column.dtype)
+        steps = np.arange(max_len)
+        mask = steps[None, :] < lengths[:, None]
+        out[mask] = column[(self.offsets[:-1, None] + steps[None, :])[mask]]
+        return out
+
+
+class TrajectoryWriter:
+    def __init__(self, path=None, obs_shape=(2,), obs_dtype=np.int32, buffer_size=65536):
+        """
+        Appends steps into preallocated columnar buffers and spills them to .npy files when full.
+
+        :param path: Directory to write the memory-mappable .npy files to. If None, everything stays in memory.
+        :param obs_shape: Shape of a single observation.
+        :param obs_dtype: Dtype of the observations.
+        :param buffer_size: Number of steps buffered before a flush.
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffers = {
+            'observations': np.zeros((buffer_size,) + tuple(obs_shape), dtype=obs_dtype),
+            'actions': np.zeros(buffer_size, dtype=np.int64),
+            'rewards': np.zeros(buffer_size, dtype=np.float64),
+            'distances': np.zeros(buffer_size, dtype=np.float64),
+            'dones': np.zeros(buffer_size, dtype=bool),
+        }
+        self._observations = self._buffers['observations']
+        self._actions = self._buffers['actions']
+        self._rewards = self._buffers['rewards']
+        self._distances = self._buffers['distances']
+        self._dones = self._buffers['dones']
+        self._n_buffered = 0
+        self._n_written = 0
+        self._offsets = [0]
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            self._files = {name: open(os.path.join(path, f'{name}.npy'), 'wb') for name in _COLUMNS}
+            for name, f in self._files.items():
+                f.write(b'\0' * _HEADER_SIZE)
+        else:
+            self._chunks = {name: [] for name in _COLUMNS}
+
+    def append(self, observation, action, reward, distance, done):
+        """
+        Records one step: the observation the action was taken from and the step's outcome.
+        """
+        self.observe(observation)
+        self.record(action, reward, distance, done)
+
+    def observe(self, observation):
+        """
+        Copies the observation of the next step into the buffer. Call this before env.step when the
+        env reuses its observation array (fast mode), then complete the row with record().
+        """
+        self._observations[self._n_buffered] = observation
+
+    def record(self, action, reward, distance, done):
+        """
+        Completes the current row started by observe().
+        """
+        i = self._n_buffered
+        self._actions[i] = action
+        self._rewards[i] = reward
+        self._distances[i] = distance
+        self._dones[i] = done
+        self._n_buffered = i + 1
+        if self._n_buffered == self.buffer_size:
+            self.flush()
+
+    def end_episode(self):
+        self._offsets.append(self._n_written + self._n_buffered)
+
+    def flush(self):
+        n = self._n_buffered
+        for name, buffer in self._buffers.items():
+            if self.path is not None:
+                self._files[name].write(buffer[:n].tobytes())
+            else:
+                self._chunks[name].append(buffer[:n].copy())
+        self._n_written += n
+        self._n_buffered = 0
+
+    def close(self):
+        """
+        Flushes the remaining steps and returns the finished TrajectoryStore.
+        """
+        self.flush()
+        offsets = np.array(self._offsets, dtype=np.int64)
+        if self.path is None:
+            return TrajectoryStore({name: np.concatenate(chunks) for name, chunks in self._chunks.items()}, offsets)
+
+        for name, f in self._files.items():
+            buffer = self._buffers[name]
+            _write_npy_header(f, (self._n_written,) + buffer.shape[1:], buffer.dtype)
+            f.close()
+        np.save(os.path.join(self.path, 'offsets.npy'), offsets)
+        return TrajectoryStore.load(self.path)